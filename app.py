@@ -6,9 +6,6 @@ including deputy loyalty, block cohesion, and attendance tracking.
 """
 
 import streamlit as st
-from src.views.dashboard import show_home
-from src.views.deputies import show_analysis_page
-from src.views.predictions import show_predictions
 
 # Configure Streamlit page
 st.set_page_config(
@@ -18,6 +15,14 @@ st.set_page_config(
 	initial_sidebar_state="collapsed"
 )
 
+@st.cache_resource
+def prepare_database():
+	"""Upgrade databases created by older versions, once per server process."""
+	from src.database.schema import upgrade_schema
+	upgrade_schema()
+
+prepare_database()
+
 # Initialize session state for navigation
 if 'page' not in st.session_state:
 	st.session_state.page = 'home'
@@ -33,14 +38,17 @@ with st.sidebar:
 	
 	st.button("Inicio", on_click=set_page, args=('home',), use_container_width=True)
 	st.button("Diputados", on_click=set_page, args=('analysis',), use_container_width=True)
-	# st.button("Predicciones", on_click=set_page, args=('predictions',), use_container_width=True)
+	st.button("Predicciones", on_click=set_page, args=('predictions',), use_container_width=True)
 	
 	st.info("Seleccione una sección para explorar diferentes aspectos del análisis legislativo.")
 
-# Main navigation logic
+# Main navigation logic (views are imported on demand to keep startup light)
 if st.session_state.page == 'home':
+	from src.views.dashboard import show_home
 	show_home()
 elif st.session_state.page == 'analysis':
+	from src.views.deputies import show_analysis_page
 	show_analysis_page()
-# elif st.session_state.page == 'predictions':
-	# show_predictions()
\ No newline at end of file
+elif st.session_state.page == 'predictions':
+	from src.views.predictions import show_predictions
+	show_predictions()
\ No newline at end of file
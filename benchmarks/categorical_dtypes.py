@@ -0,0 +1,107 @@
+"""
+Categorical Dtypes Benchmark
+
+Builds a synthetic vote history shaped like the output of
+compare_block_deputies_preference and compares memory usage and the
+analyze_votations groupby time between object-dtype strings with int64
+flags and categorical columns with bool flags.
+
+Usage:
+	python -m benchmarks.categorical_dtypes [--votations N] [--deputies N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.processing.analyzer import VOTE_CATEGORIES
+
+FLAG_COLUMNS = ['loyalty', 'supported_officialism', 'accerted', 'absent', 'not_voted', 'abstention']
+
+
+def build_history(votations, deputies, blocks=30, seed=0):
+	"""Returns (object-dtype frame, categorical frame) with the same content."""
+	rng = np.random.default_rng(seed)
+	rows = votations * deputies
+
+	deputy_names = np.array([f"DEPUTY {i:04d}, NAME" for i in range(deputies)], dtype=object)
+	block_names = np.array([f"Bloque {i:02d}" for i in range(blocks)], dtype=object)
+	deputy_block = rng.integers(0, blocks, deputies)
+
+	deputy_codes = np.tile(np.arange(deputies), votations)
+	vote_codes = rng.choice(5, size=rows, p=[0.55, 0.3, 0.02, 0.01, 0.12])
+
+	object_df = pd.DataFrame({
+		'block': block_names[deputy_block[deputy_codes]],
+		'deputy': deputy_names[deputy_codes],
+		'vote': np.array(VOTE_CATEGORIES, dtype=object)[vote_codes],
+	}, dtype=object)
+	for column in FLAG_COLUMNS:
+		object_df[column] = rng.integers(0, 2, rows).astype('int64')
+
+	compact_df = object_df.astype({
+		'block': pd.CategoricalDtype(sorted(block_names)),
+		'deputy': pd.CategoricalDtype(sorted(deputy_names)),
+		'vote': pd.CategoricalDtype(VOTE_CATEGORIES),
+	})
+	compact_df[FLAG_COLUMNS] = compact_df[FLAG_COLUMNS].astype(bool)
+
+	return object_df, compact_df
+
+
+def aggregate(df, **groupby_kwargs):
+	"""Same aggregation as analyze_votations."""
+	df = df.assign(vote_count=df['vote'].isin(['AFIRMATIVO', 'NEGATIVO']))
+	return df.groupby(['block', 'deputy'], **groupby_kwargs).agg(
+		average_loyalty=('loyalty', 'mean'),
+		total_votes=('vote_count', 'sum'),
+		total_participation=('vote', 'count'),
+		officialism_support=('supported_officialism', 'mean'),
+		accerted=('accerted', 'sum'),
+		absent=('absent', 'sum'),
+		not_voted=('not_voted', 'sum'),
+		abstention=('abstention', 'sum')
+	)
+
+
+def best_time(function, repeat=3):
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		timings.append(time.perf_counter() - start)
+	return min(timings)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--votations', type=int, default=2000)
+	parser.add_argument('--deputies', type=int, default=257)
+	args = parser.parse_args()
+
+	object_df, compact_df = build_history(args.votations, args.deputies)
+	print(f"Synthetic history: {len(object_df):,} rows ({args.votations} votations x {args.deputies} deputies)")
+
+	object_mb = object_df.memory_usage(deep=True).sum() / 1e6
+	compact_mb = compact_df.memory_usage(deep=True).sum() / 1e6
+	print(f"Memory:  object {object_mb:8.1f} MB | categorical {compact_mb:8.1f} MB | {object_mb / compact_mb:.1f}x")
+
+	object_s = best_time(lambda: aggregate(object_df))
+	compact_s = best_time(lambda: aggregate(compact_df, observed=True))
+	print(f"Groupby: object {object_s * 1000:8.1f} ms | categorical {compact_s * 1000:8.1f} ms | {object_s / compact_s:.1f}x")
+
+	pd.testing.assert_frame_equal(
+		aggregate(object_df),
+		aggregate(compact_df, observed=True).pipe(
+			lambda df: df.set_axis(df.index.set_levels([level.astype(object) for level in df.index.levels]))
+		),
+		check_dtype=False,
+		check_index_type=False,
+	)
+	print("OK: both representations produce the same aggregates.")
+
+
+if __name__ == '__main__':
+	main()
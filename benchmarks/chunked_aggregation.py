@@ -0,0 +1,75 @@
+"""
+Chunked Aggregation Benchmark
+
+Measures the peak memory and time of the in-memory (pandas) and
+out-of-core (chunked) backends of analyze_votations on synthetic databases
+of increasing size, checking that both return exactly the same frame.
+
+Usage:
+	python -m benchmarks.chunked_aggregation [--sizes 500 2000 8000] [--deputies N] [--chunk-size N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic import build_synthetic_database
+
+# Runs in a fresh interpreter because the database URL is read at import time;
+# tracemalloc sees the numpy and pandas buffers as well as Python objects
+RUNNER = """
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from src.queries import analyze_votations
+
+results = {}
+for backend in ('pandas', 'chunked'):
+	tracemalloc.start()
+	start = time.perf_counter()
+	results[backend] = analyze_votations(backend=backend, chunk_size=int(sys.argv[1]))
+	elapsed = time.perf_counter() - start
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	print(f"{elapsed:.3f} {peak / 2**20:.1f}", end=' ')
+
+pd.testing.assert_frame_equal(results['pandas'], results['chunked'], check_exact=True)
+"""
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 8000], help='Numbers of votations')
+	parser.add_argument('--deputies', type=int, default=257)
+	parser.add_argument('--chunk-size', type=int, default=500, help='Votations per chunk')
+	args = parser.parse_args()
+
+	base_dir = Path(__file__).resolve().parent.parent
+
+	print(f"{'votations':>10} {'rows':>10} {'pandas (s)':>11} {'peak (MB)':>10} {'chunked (s)':>12} {'peak (MB)':>10}")
+	with tempfile.TemporaryDirectory() as tmp:
+		for votations in args.sizes:
+			url = build_synthetic_database(Path(tmp) / f"synthetic_{votations}.db", votations, args.deputies)
+			completed = subprocess.run(
+				[sys.executable, '-c', RUNNER, str(args.chunk_size)],
+				cwd=base_dir,
+				env={**os.environ, 'DATABASE_URL': url},
+				capture_output=True,
+				text=True,
+			)
+			if completed.returncode != 0:
+				print(completed.stderr)
+				sys.exit(1)
+
+			pandas_s, pandas_mb, chunked_s, chunked_mb = map(float, completed.stdout.split())
+			print(f"{votations:>10} {votations * args.deputies:>10} {pandas_s:>11.3f} {pandas_mb:>10.1f} {chunked_s:>12.3f} {chunked_mb:>10.1f}")
+
+	print("OK: both backends returned identical results.")
+
+
+if __name__ == '__main__':
+	main()
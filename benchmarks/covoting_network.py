@@ -0,0 +1,54 @@
+"""
+Co-voting Network Benchmark
+
+Builds the co-voting graph and detects communities on synthetic chambers
+of increasing size, reporting time, peak memory, graph size and how well
+the detected communities recover the synthetic blocks (each synthetic
+block votes independently, so communities should match blocks).
+
+Usage:
+	python -m benchmarks.covoting_network [--deputies 257 1000 3000] [--votations N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_votes
+from src.processing.network import build_covoting_graph, detect_communities, adjusted_rand_index
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--deputies', type=int, nargs='+', default=[257, 1000, 3000])
+	parser.add_argument('--votations', type=int, default=300)
+	parser.add_argument('--blocks', type=int, default=20)
+	args = parser.parse_args()
+
+	print(f"{'deputies':>9} {'rows':>10} {'graph (s)':>10} {'louvain (s)':>12} {'peak MB':>8} {'edges':>10} {'communities':>12} {'ARI':>6}")
+	for deputies in args.deputies:
+		_, votes_df = generate_votes(args.votations, deputies, args.blocks)
+		votes_df = votes_df[votes_df['vote'] != 'PRESIDENTE']
+
+		tracemalloc.start()
+		start = time.perf_counter()
+		graph, deputy_index = build_covoting_graph(votes_df)
+		graph_s = time.perf_counter() - start
+
+		start = time.perf_counter()
+		communities = detect_communities(graph)
+		louvain_s = time.perf_counter() - start
+		_, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+
+		blocks = votes_df.groupby('deputy')['block'].last().reindex(deputy_index)
+		ari = adjusted_rand_index(communities, blocks)
+
+		print(
+			f"{deputies:>9} {len(votes_df):>10} {graph_s:>10.2f} {louvain_s:>12.2f} {peak / 1e6:>8.1f} "
+			f"{graph.nnz // 2:>10} {communities.max() + 1:>12} {ari:>6.2f}"
+		)
+
+
+if __name__ == '__main__':
+	main()
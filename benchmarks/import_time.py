@@ -0,0 +1,96 @@
+"""
+Import Time Benchmark
+
+Measures how long the UI modules take to import using `python -X importtime`
+and checks that the scraping stack is never loaded by the Streamlit process.
+
+Usage:
+	python benchmarks/import_time.py [--top N] [--repeat N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Modules imported by the Streamlit process during a normal session
+UI_MODULES = [
+	'src.views.dashboard',
+	'src.views.deputies',
+	'src.views.deputy_profile',
+	'src.views.predictions',
+]
+
+# Modules that must never be loaded at UI startup. Plain `plotly` is not
+# listed because streamlit imports it to register its chart theme; the
+# much heavier `plotly.express` is only imported when a chart is drawn,
+# and scipy only when the dashboard fits the scaling and network models.
+FORBIDDEN_MODULES = ['requests', 'bs4', 'src.scraping', 'src.ingest', 'plotly.express', 'scipy']
+
+
+def run_importtime(modules):
+	"""
+	Import the given modules in a fresh interpreter with -X importtime.
+
+	Returns:
+		tuple: (list of (cumulative_us, module) entries, set of loaded module names)
+	"""
+	code = (
+		f"import {', '.join(modules)}, sys;"
+		"print('\\n'.join(sys.modules))"
+	)
+	completed = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', code],
+		cwd=BASE_DIR,
+		capture_output=True,
+		text=True,
+		check=True,
+	)
+
+	entries = []
+	for line in completed.stderr.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		_, cumulative_us, name = line.split('|')
+		# Nested imports are indented below their parent; keep the indentation
+		entries.append((int(cumulative_us.strip()), name[1:].rstrip()))
+
+	return entries, set(completed.stdout.split())
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--top', type=int, default=15, help='Number of slowest top-level imports to show')
+	parser.add_argument('--repeat', type=int, default=5, help='Number of fresh interpreters to run')
+	args = parser.parse_args()
+
+	totals = []
+	for _ in range(args.repeat):
+		entries, loaded = run_importtime(UI_MODULES)
+		top_level = [(us, name) for us, name in entries if not name.startswith(' ')]
+		totals.append(sum(us for us, _ in top_level))
+
+	print(f"UI import time over {args.repeat} runs: "
+		  f"median {statistics.median(totals) / 1000:.1f} ms, "
+		  f"min {min(totals) / 1000:.1f} ms, max {max(totals) / 1000:.1f} ms")
+
+	print(f"\nSlowest {args.top} top-level imports (last run):")
+	for us, name in sorted(top_level, reverse=True)[:args.top]:
+		print(f"  {us / 1000:8.1f} ms  {name}")
+
+	leaked = sorted(
+		module for module in loaded
+		if any(module == forbidden or module.startswith(forbidden + '.') for forbidden in FORBIDDEN_MODULES)
+	)
+	if leaked:
+		print(f"\nERROR: UI process loaded heavy/ingest modules: {', '.join(leaked)}")
+		sys.exit(1)
+
+	print("\nOK: scraping, plotting and scipy modules are not loaded at startup.")
+
+
+if __name__ == '__main__':
+	main()
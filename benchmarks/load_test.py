@@ -0,0 +1,255 @@
+"""
+Concurrent Session Load Test
+
+Drives the Streamlit application headlessly with many simulated users at
+once, each one an AppTest session in its own thread sharing the process
+caches, as sessions do in a Streamlit server. Every session navigates
+like a visitor: home dashboard, deputies list, block filter, name search,
+topic filter, pagination and profile clicks. The harness reports the
+p50/p95/p99 rerun latency per view and the memory growth per session on
+synthetic databases of increasing size (or on a given database).
+
+Usage:
+	python -m benchmarks.load_test [--sizes 100 500 2000] [--sessions 20] [--steps 8] [--database URL]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import build_synthetic_database
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+APP_PATH = BASE_DIR / "app.py"
+
+
+def peak_rss_mb():
+	"""Peak resident memory of this process in MB (ru_maxrss is in KB on Linux)."""
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Session:
+	"""A simulated visitor: one AppTest instance and the timings of its reruns."""
+
+	def __init__(self, seed, timeout):
+		from streamlit.testing.v1 import AppTest
+
+		self.app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+		self.random = random.Random(seed)
+		self.timings = []
+		self.errors = []
+		self.stopped = False
+
+	def rerun(self, view, action):
+		"""
+		Apply an interaction (a callable returning the AppTest) and time the
+		rerun. When AppTest loses the session's widget state under load
+		every later rerun fails the same way, so the error is recorded and
+		the session stops instead of aborting the whole run.
+		"""
+		start = time.perf_counter()
+		try:
+			action().run()
+		except (KeyError, IndexError) as error:
+			self.errors.append(f"{view}: rerun failed, session stopped ({type(error).__name__})")
+			self.stopped = True
+			return
+		self.timings.append((view, time.perf_counter() - start))
+		if self.app.exception:
+			self.errors.append(f"{view}: {self.app.exception[0].message}")
+
+	def view(self):
+		if self.app.session_state.page != 'analysis':
+			return self.app.session_state.page
+		return 'profile' if self.app.session_state.selected_deputy else 'list'
+
+	def button(self, label):
+		return next((button for button in self.app.button if button.label == label), None)
+
+	def widget(self, kind, key):
+		return next((widget for widget in getattr(self.app, kind) if widget.key == key), None)
+
+	def step(self):
+		"""
+		Perform one random navigation allowed by the current page. Under load
+		a rerun can render only part of a page (e.g. just the sidebar, or
+		nothing); the missing widgets are recorded as an error and the step
+		falls back to the sidebar, or to rerunning the page.
+		"""
+		view = self.view()
+		sidebar = self.app.sidebar.button
+		if len(sidebar) < 2:
+			# Nothing rendered at all: rerun the same page
+			self.errors.append(f"{view}: page rendered without the sidebar")
+			return self.rerun(view, lambda: self.app)
+
+		actions = [lambda: sidebar[0].click(), lambda: sidebar[1].click()]
+		fallback = list(actions)
+
+		if view == 'list':
+			block_filter = self.widget('selectbox', 'block_filter')
+			search = self.widget('text_input', 'search_term')
+			topic = self.widget('text_input', 'topic_filter')
+			if None in (block_filter, search, topic):
+				self.errors.append(f"{view}: page rendered without the list widgets")
+				return self.rerun(view, self.random.choice(fallback))
+
+			names = [subheader.value for subheader in self.app.subheader if ',' in subheader.value]
+			profiles = [button for button in self.app.button if button.label == "Ver Perfil"]
+			next_page = self.button("Siguiente")
+
+			actions += [lambda: block_filter.select(self.random.choice(block_filter.options))]
+			if names:
+				# Search a fragment of a surname shown on the page
+				surname = self.random.choice(names).split(',')[0]
+				actions += [lambda: search.input(surname[:self.random.randint(3, max(3, len(surname)))])]
+			if search.value or topic.value:
+				actions += [lambda: search.input(''), lambda: topic.input('')]
+			actions += [lambda: topic.input(self.random.choice(['proyecto', 'ley', 'presupuesto', 'sintético 1']))]
+			if profiles:
+				actions += [lambda: self.random.choice(profiles).click()] * 2
+			if next_page is not None:
+				actions += [lambda: next_page.click()] * 2
+		elif view == 'profile':
+			back = self.button("Volver a la lista de diputados")
+			if back is None:
+				self.errors.append(f"{view}: page rendered without the back button")
+				return self.rerun(view, self.random.choice(fallback))
+
+			actions += [lambda: back.click()] * 3
+
+		self.rerun(view, self.random.choice(actions))
+
+	def navigate(self, steps):
+		"""Open the home page, then perform random navigation steps."""
+		self.rerun('home', lambda: self.app)
+		if not self.stopped:
+			self.rerun('list', lambda: self.app.sidebar.button[1].click())
+		for _ in range(steps):
+			if self.stopped:
+				break
+			self.step()
+		return self
+
+
+def percentiles(timings):
+	values = np.array(timings) * 1000
+	return {'n': len(values), 'p50': np.percentile(values, 50), 'p95': np.percentile(values, 95), 'p99': np.percentile(values, 99)}
+
+
+def run_sessions(sessions, steps, timeout, seed):
+	"""
+	Run one cold-cache session, then the concurrent sessions.
+
+	Returns:
+		dict: Cold-start latency, per-view percentiles (ms), memory (MB), errors
+			  and the number of sessions stopped before their last step
+	"""
+	start = time.perf_counter()
+	cold = Session(seed, timeout).navigate(0)
+	cold_s = time.perf_counter() - start
+	baseline_mb = peak_rss_mb()
+
+	with ThreadPoolExecutor(max_workers=sessions) as executor:
+		results = list(executor.map(lambda i: Session(seed + 1 + i, timeout).navigate(steps), range(sessions)))
+
+	timings = [timing for session in results for timing in session.timings]
+	views = sorted({view for view, _ in timings})
+
+	return {
+		'cold_start_s': cold_s,
+		'all': percentiles([seconds for _, seconds in timings]),
+		'views': {view: percentiles([seconds for name, seconds in timings if name == view]) for view in views},
+		'baseline_mb': baseline_mb,
+		'per_session_mb': (peak_rss_mb() - baseline_mb) / sessions,
+		'errors': cold.errors + [error for session in results for error in session.errors],
+		'sessions': sessions,
+		'stopped': sum(session.stopped for session in results),
+	}
+
+
+def run_worker(url, processed_dir, args):
+	"""
+	Run the sessions in a fresh interpreter, since the database URL is read
+	at import time. Models cached on disk go to processed_dir, so synthetic
+	runs never overwrite the application's own cache.
+	"""
+	completed = subprocess.run(
+		[sys.executable, '-m', 'benchmarks.load_test', '--worker',
+		 '--sessions', str(args.sessions), '--steps', str(args.steps),
+		 '--timeout', str(args.timeout), '--seed', str(args.seed)],
+		cwd=BASE_DIR,
+		env={**os.environ, 'DATABASE_URL': url, 'PROCESSED_DATA_DIR': str(processed_dir)},
+		capture_output=True,
+		text=True,
+	)
+	if completed.returncode != 0:
+		print(completed.stderr)
+		sys.exit(1)
+
+	return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def report(label, result):
+	"""Print the results of a run; returns False when sessions stopped early."""
+	print(f"\n{label}: cold start {result['cold_start_s']:.1f}s, "
+		  f"{result['per_session_mb']:.1f} MB per session (baseline {result['baseline_mb']:.0f} MB)")
+	if result['stopped']:
+		# The percentiles then cover fewer concurrent users than requested
+		print(f"  INVALID: {result['stopped']} of {result['sessions']} sessions stopped early")
+	print(f"{'view':>10} {'reruns':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+	for view, stats in [*result['views'].items(), ('all', result['all'])]:
+		print(f"{view:>10} {stats['n']:>7} {stats['p50']:>9.0f} {stats['p95']:>9.0f} {stats['p99']:>9.0f}")
+	for error in sorted(set(result['errors'])):
+		print(f"  error: {error}")
+
+	return not result['stopped']
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000], help='Numbers of votations')
+	parser.add_argument('--deputies', type=int, default=257)
+	parser.add_argument('--sessions', type=int, default=20, help='Concurrent sessions')
+	parser.add_argument('--steps', type=int, default=8, help='Navigation steps per session')
+	parser.add_argument('--timeout', type=float, default=300, help='Seconds allowed per rerun')
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--database', help='Test this database URL instead of synthetic ones')
+	parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.worker:
+		# Keep the app's own output away from the JSON result
+		with open(os.devnull, 'w') as devnull:
+			stdout, sys.stdout = sys.stdout, devnull
+			result = run_sessions(args.sessions, args.steps, args.timeout, args.seed)
+			sys.stdout = stdout
+		print(json.dumps(result))
+		return
+
+	print(f"{args.sessions} concurrent sessions, {args.steps} navigation steps each")
+	with tempfile.TemporaryDirectory() as tmp:
+		if args.database:
+			valid = report(args.database, run_worker(args.database, Path(tmp), args))
+		else:
+			valid = True
+			for votations in args.sizes:
+				url = build_synthetic_database(Path(tmp) / f"synthetic_{votations}.db", votations, args.deputies)
+				valid &= report(f"{votations} votations x {args.deputies} deputies", run_worker(url, Path(tmp) / str(votations), args))
+
+	if not valid:
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,68 @@
+"""
+SQL Aggregation Benchmark
+
+Compares the pandas and SQL backends of analyze_votations on synthetic
+databases of increasing size, checking that both return the same frame.
+
+Usage:
+	python -m benchmarks.sql_aggregation [--sizes 100 500 2000] [--deputies N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic import build_synthetic_database
+
+# Runs in a fresh interpreter because the database URL is read at import time
+RUNNER = """
+import time
+import pandas as pd
+from src.queries import analyze_votations
+
+timings = {}
+results = {}
+for backend in ('pandas', 'sql'):
+	start = time.perf_counter()
+	results[backend] = analyze_votations(backend=backend)
+	timings[backend] = time.perf_counter() - start
+
+pd.testing.assert_frame_equal(results['pandas'], results['sql'])
+print(f"{timings['pandas']:.3f} {timings['sql']:.3f}")
+"""
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000], help='Numbers of votations')
+	parser.add_argument('--deputies', type=int, default=257)
+	args = parser.parse_args()
+
+	base_dir = Path(__file__).resolve().parent.parent
+
+	print(f"{'votations':>10} {'rows':>10} {'pandas (s)':>11} {'sql (s)':>9} {'speedup':>8}")
+	with tempfile.TemporaryDirectory() as tmp:
+		for votations in args.sizes:
+			url = build_synthetic_database(Path(tmp) / f"synthetic_{votations}.db", votations, args.deputies)
+			completed = subprocess.run(
+				[sys.executable, '-c', RUNNER],
+				cwd=base_dir,
+				env={**os.environ, 'DATABASE_URL': url},
+				capture_output=True,
+				text=True,
+			)
+			if completed.returncode != 0:
+				print(completed.stderr)
+				sys.exit(1)
+
+			pandas_s, sql_s = map(float, completed.stdout.split())
+			print(f"{votations:>10} {votations * args.deputies:>10} {pandas_s:>11.3f} {sql_s:>9.3f} {pandas_s / sql_s:>7.1f}x")
+
+	print("OK: both backends returned identical results.")
+
+
+if __name__ == '__main__':
+	main()
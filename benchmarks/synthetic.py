@@ -0,0 +1,136 @@
+"""
+Synthetic Chamber Generator
+
+Generates synthetic chambers, in memory or as SQLite databases with the
+application schema, used by the benchmarks to measure scaling. Each block
+has a random discipline; on every votation each block picks a position
+and its deputies follow it with that probability, are absent, or abstain.
+
+Usage:
+	python -m benchmarks.synthetic PATH [--votations N] [--deputies N] [--blocks N]
+"""
+
+import argparse
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from src.database.connections import Base
+from src.database import models  # noqa: F401 (registers the tables)
+from src.processing.analyzer import OFFICIALISM_BLOCK
+
+
+def generate_votes(votations=500, deputies=257, blocks=20, seed=0, start=date(2020, 1, 1)):
+	"""
+	Generate a synthetic vote history shaped like get_votes_history.
+
+	Args:
+		votations (int): Number of votations
+		deputies (int): Number of seats in the chamber
+		blocks (int): Number of blocks; the first one is the officialism
+		seed (int): Random seed
+		start (date): Date of the first votation (one votation per day)
+
+	Returns:
+		tuple: (metadata pd.DataFrame with one row per votation,
+				votes pd.DataFrame with columns vote_id, date, deputy, block, province and vote)
+	"""
+	rng = np.random.default_rng(seed)
+	block_names = np.array([OFFICIALISM_BLOCK] + [f"Bloque Sintético {i:02d}" for i in range(1, blocks)], dtype=object)
+	provinces = np.array([f"Provincia {i:02d}" for i in range(24)], dtype=object)
+	deputy_names = np.array([f"DIPUTADO {seat:05d}, SINTÉTICO" for seat in range(deputies)], dtype=object)
+
+	# Larger blocks first
+	block_sizes = rng.dirichlet(np.ones(blocks) * 0.8)
+	deputy_block = np.sort(rng.choice(blocks, size=deputies, p=block_sizes))
+	deputy_province = rng.integers(0, len(provinces), deputies)
+	discipline = rng.uniform(0.75, 0.99, blocks)
+
+	vote_ids = np.array([str(100000 + number) for number in range(votations)], dtype=object)
+	dates = np.array([start + timedelta(days=number) for number in range(votations)], dtype=object)
+
+	positions = rng.integers(0, 2, (votations, blocks))
+	follows = rng.random((votations, deputies)) < discipline[deputy_block]
+	block_position = positions[:, deputy_block]
+	position = np.where(follows, block_position, 1 - block_position)
+	votes = np.where(position == 1, 'AFIRMATIVO', 'NEGATIVO').astype(object)
+
+	other = rng.random((votations, deputies))
+	votes[other < 0.10] = 'AUSENTE'
+	votes[(other >= 0.10) & (other < 0.12)] = 'ABSTENCION'
+	votes[:, 0] = 'PRESIDENTE'
+
+	metadata_df = pd.DataFrame({
+		'id': vote_ids,
+		'date': dates,
+		'title': [f"Proyecto sintético {number}" for number in range(votations)],
+		'type': 'Votación Nominal',
+		'result': 'negative',
+		'loaded': True,
+		'analyzed': False,
+	})
+	votes_df = pd.DataFrame({
+		'vote_id': np.repeat(vote_ids, deputies),
+		'date': np.repeat(dates, deputies),
+		'deputy': np.tile(deputy_names, votations),
+		'block': np.tile(block_names[deputy_block], votations),
+		'province': np.tile(provinces[deputy_province], votations),
+		'vote': votes.ravel(),
+	})
+
+	return metadata_df, votes_df
+
+
+def build_synthetic_database(path, votations=500, deputies=257, blocks=20, seed=0, start=date(2020, 1, 1)):
+	"""
+	Create (or overwrite) a SQLite database with a synthetic vote history.
+
+	Args:
+		path (str | Path): Database file to create
+		votations, deputies, blocks, seed, start: See generate_votes
+
+	Returns:
+		str: SQLAlchemy URL of the created database
+	"""
+	path = Path(path)
+	path.unlink(missing_ok=True)
+	url = f"sqlite:///{path}"
+	Base.metadata.create_all(bind=create_engine(url))
+
+	metadata_df, votes_df = generate_votes(votations, deputies, blocks, seed, start)
+	metadata_df['date'] = metadata_df['date'].map(date.isoformat)
+
+	connection = sqlite3.connect(path)
+	with connection:
+		connection.executemany(
+			"INSERT INTO votation_metadata (id, date, title, type, result, loaded, analyzed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+			metadata_df[['id', 'date', 'title', 'type', 'result', 'loaded', 'analyzed']].itertuples(index=False)
+		)
+		connection.executemany(
+			"INSERT INTO deputies_votes (vote_id, deputy, block, province, vote) VALUES (?, ?, ?, ?, ?)",
+			votes_df[['vote_id', 'deputy', 'block', 'province', 'vote']].itertuples(index=False)
+		)
+	connection.close()
+
+	return url
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('path')
+	parser.add_argument('--votations', type=int, default=500)
+	parser.add_argument('--deputies', type=int, default=257)
+	parser.add_argument('--blocks', type=int, default=20)
+	parser.add_argument('--seed', type=int, default=0)
+	args = parser.parse_args()
+
+	url = build_synthetic_database(args.path, args.votations, args.deputies, args.blocks, args.seed)
+	print(f"Created {url} with {args.votations} votations x {args.deputies} deputies")
+
+
+if __name__ == '__main__':
+	main()
@@ -1,162 +1,100 @@
 """
 Legislative Votation Analysis Module
 
-This module provides functionality to scrape, process, and analyze 
-Argentine legislative voting data, including deputy loyalty and 
-support for government positions.
+Command line entry point. The scraping and ingest code lives in
+`src.ingest` and the read-only query/analysis API in `src.queries`;
+both are re-exported here for backwards compatibility.
+
+Usage:
+	python main.py            Run the analysis and export the deputy timelines
+	                          (--backend chunked for histories that don't fit in memory)
+	python main.py sync       Run the sync daemon that keeps the database current
+	                          (--sources to choose the chambers ingested)
+	python main.py check      Check deputies_votes for duplicates and bad values (--repair to fix)
 """
 
-import pandas as pd
+import argparse
 
-# Importaciones internas
-from src.scraping.scrape import scrape_votation_metadata, scrape_votation_data
-from src.processing.analyzer import determine_loyalty_votation
-from src.database.crud import save_votation_metadata
-from src.database.connections import SessionLocal, Base, engine
-from src.database.models import VotationMetadata, DeputiesVoting
-from paths import VOTATIONS_DIR
+from src.database.connections import SessionLocal
+from src.database.integrity import check_integrity, repair_integrity
+from src.database.schema import upgrade_schema
+from src.ingest import update_votation_metadata, update_votation_data, run_sync_daemon
+from src.scraping.sources import SOURCES, DEFAULT_SOURCES
+from src.queries import analyze_votations, build_deputy_timelines, get_votations_metadata, get_votation_data
+from paths import DEPUTY_TIMELINES_PATH
 
 
 def main():
 	"""Main entry point for the legislative analysis application."""
-	Base.metadata.create_all(bind=engine)
-	analyze_votations()
-
-
-def update_votation_metadata():
+	parser = argparse.ArgumentParser(description="Argentine legislative votation analysis")
+	parser.add_argument('--backend', choices=['pandas', 'sql', 'chunked'], default='pandas', help="Analysis backend")
+	parser.add_argument('--chunk-size', type=int, default=500, help="Votations per chunk of the chunked backend")
+	subparsers = parser.add_subparsers(dest='command')
+
+	sync_parser = subparsers.add_parser('sync', help="Keep the database current with the chamber website")
+	sync_parser.add_argument('--interval', type=int, default=3600, help="Seconds between sync cycles")
+	sync_parser.add_argument('--workers', type=int, default=2, help="Concurrent scrape workers per source")
+	sync_parser.add_argument('--sources', nargs='+', choices=sorted(SOURCES), default=DEFAULT_SOURCES, help="Chambers to ingest")
+	sync_parser.add_argument('--verify-days', type=int, default=30, help="Re-verify actas of the last N days")
+	sync_parser.add_argument('--once', action='store_true', help="Run a single sync cycle and exit")
+
+	check_parser = subparsers.add_parser('check', help="Check the stored votes for integrity problems")
+	check_parser.add_argument('--repair', action='store_true', help="Repair the problems found")
+
+	args = parser.parse_args()
+
+	upgrade_schema()
+
+	if args.command == 'sync':
+		run_sync_daemon(
+			interval_seconds=args.interval,
+			workers=args.workers,
+			verify_days=args.verify_days,
+			iterations=1 if args.once else None,
+			sources=args.sources
+		)
+	elif args.command == 'check':
+		run_integrity_check(repair=args.repair)
+	else:
+		analyze_votations(backend=args.backend, chunk_size=args.chunk_size)
+		export_deputy_timelines()
+
+
+def export_deputy_timelines():
+	"""Compute the per-deputy timelines and store them for the profile pages."""
+	timelines = build_deputy_timelines()
+	DEPUTY_TIMELINES_PATH.parent.mkdir(parents=True, exist_ok=True)
+	timelines.save(DEPUTY_TIMELINES_PATH)
+	print(f"Saved timelines of {len(timelines.deputies)} deputies to {DEPUTY_TIMELINES_PATH}.")
+
+
+def run_integrity_check(repair=False):
 	"""
-	Update the laws metadata by scraping the latest votation data.
-	
-	Returns:
-		int: Number of new votations added to the database
-	"""
-	new_law_list = scrape_votation_metadata(year=2024)
-
-	db = SessionLocal()
-
-	new_votation_count = save_votation_metadata(db, new_law_list)
-
-	db.close()
-
-	print(f"Added {new_votation_count} new votations metadata to the database.")
-
-	return new_votation_count
-
-
-def update_votation_data():
-	"""
-	Scrape votation data for each votation in the database that hasn't been loaded yet.
-	Updates the loaded status for each processed votation.
-	"""
-	db = SessionLocal()
-	votation_metadata = db.query(VotationMetadata).filter(VotationMetadata.loaded == False).all()
-
-	for votation in votation_metadata:
-		votation_id = votation.id
-		print(f"Scraping data for votation {votation_id}...")
-		votation_data = scrape_votation_data(votation_id)
-		
-		if votation_data:
-			print(f"Processing votation data for {votation_id}...")
-			print(f"Found {len(votation_data)} votes for votation {votation_id}.")
-			for data in votation_data:
-				data['vote_id'] = votation_id
-				deputy_vote = DeputiesVoting(**data)
-				db.add(deputy_vote)
-		votation.loaded = True
-		db.add(votation)
-
-	db.commit()
-	db.close()
-	print("Votation data updated successfully.")
-
-
-def analyze_votations():
-	"""
-	Analyze all votations and return comprehensive statistics.
-	
-	Returns:
-		pd.DataFrame: Grouped analysis with deputy loyalty statistics,
-					 indexed by block and deputy name, with columns:
-					 - average_loyalty: Mean loyalty to party block
-					 - total_votes: Number of votes cast by deputy
-					 - officialism_support: Support rate for government positions
-					 - accerted: Number of correct predictions (placeholder)
-	"""
-	db = SessionLocal()
-
-	# Get all votation IDs from database
-	query = db.query(VotationMetadata.id).all()
-	id_list = [int(row.id) for row in query]
-
-	votations_result = []
-
-	for votation_id in id_list:
-		# Query votation data for current ID
-		query = db.query(DeputiesVoting).filter(DeputiesVoting.vote_id == votation_id)
-		votation_df = pd.read_sql(query.statement, db.bind, index_col='id')
-		
-		# Exclude the president from analysis (not a regular deputy)
-		votation_df = votation_df[votation_df['vote'] != 'PRESIDENTE']
-
-		# Analyze loyalty for this specific votation
-		votation_result = determine_loyalty_votation(votation_df)
-		votations_result.append(votation_result)
-
-	db.close()
-
-	# Combine all votation results
-	df_merged = pd.concat(votations_result)
-
-	# Create a new column for counting only AFIRMATIVO and NEGATIVO votes
-	df_merged['vote_count'] = df_merged['vote'].apply(lambda x: 1 if x in ['AFIRMATIVO', 'NEGATIVO'] else 0)
-
-	# Group by block and deputy to get aggregate statistics
-	final_analysis_df = df_merged.groupby(['block', 'deputy']).agg(
-		average_loyalty=('loyalty', 'mean'),
-		total_votes=('vote_count', 'sum'),
-		total_participation=('vote', 'count'),
-		officialism_support=('supported_officialism', 'mean'),
-		accerted=('accerted', 'sum'),
-		absent=('absent', 'sum'),
-		not_voted=('not_voted', 'sum'),
-		abstention=('abstention', 'sum')
-	)
-	
-	return final_analysis_df
-
-def get_votations_metadata():
-	"""
-	Retrieve all votation metadata from the database.
-	
-	Returns:
-		pd.DataFrame: Votation metadata with columns including ID, date, title, 
-					 type, result, loaded status, and analyzed status
-	"""
-	db = SessionLocal()
-	query = db.query(VotationMetadata)
-	df = pd.read_sql(query.statement, db.bind, index_col='id')
-	db.close()
-	return df
-
-
-def get_votation_data(votation_id):
-	"""
-	Retrieve votation data for a specific votation ID.
+	Print the integrity problems of the stored votes and optionally repair them.
 	
 	Args:
-		votation_id (int): The ID of the votation to retrieve
-		
-	Returns:
-		pd.DataFrame: Votation data with columns including vote ID, deputy name,
-					 block name, province, and vote
+		repair (bool): Repair the problems found
 	"""
 	db = SessionLocal()
-	query = db.query(DeputiesVoting).filter(DeputiesVoting.vote_id == votation_id)
-	df = pd.read_sql(query.statement, db.bind, index_col='id')
+	report = check_integrity(db)
+
+	print(f"Duplicated (vote_id, deputy) rows: {len(report['duplicates'])}")
+	print(f"Unknown vote values: {len(report['unknown_votes'])}")
+	if not report['unknown_votes'].empty:
+		print(report['unknown_votes']['vote'].value_counts().to_string())
+	print(f"Actas with implausible deputy counts: {len(report['implausible_actas'])}")
+	if not report['implausible_actas'].empty:
+		print(report['implausible_actas'].to_string(index=False))
+
+	if repair:
+		result = repair_integrity(db, report)
+		print(
+			f"Deleted {result['deleted']} duplicated rows, normalized {result['normalized']} votes, "
+			f"queued {result['requeued']} actas to be scraped again."
+		)
+
 	db.close()
-	return df
 
 
 if __name__ == "__main__":
-	main()
\ No newline at end of file
+	main()
@@ -1,9 +1,11 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 
 DATA_DIR = BASE_DIR / "data"
 VOTATIONS_DIR = DATA_DIR / "votations"
-PROCESSED_DATA_DIR = DATA_DIR / "processed"
+PROCESSED_DATA_DIR = Path(os.environ.get("PROCESSED_DATA_DIR", DATA_DIR / "processed"))
+DEPUTY_TIMELINES_PATH = PROCESSED_DATA_DIR / "deputy_timelines.npz"
 NOTEBOOKS_DIR = BASE_DIR / "notebooks"
 SRC_DIR = BASE_DIR / "src"
\ No newline at end of file
@@ -1,11 +1,18 @@
 import streamlit as st
 import pandas as pd
-import sys
-import os
+import threading
+
+from src.queries import (
+	analyze_votations, get_votes_history, get_votation_results, analyze_topic, get_votations_metadata,
+	build_deputy_timelines
+)
+from src.processing.predictor import VotationPredictor
+from src.processing.timelines import DeputyTimelines
+from src.snapshots import get_last_update_changes
+from paths import PROCESSED_DATA_DIR, DEPUTY_TIMELINES_PATH
+
+IDEAL_POINTS_PATH = PROCESSED_DATA_DIR / "ideal_points.npz"
 
-# Añadir directorio raíz al path para importar main
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from main import analyze_votations
 
 @st.cache_data
 def load_analysis_data():
@@ -17,7 +24,192 @@ def load_analysis_data():
 	"""
 	print("Executing complete analysis...")
 	
-	df_votation = analyze_votations()
+	df_votation = analyze_votations(backend='sql')
 	df = df_votation.reset_index()
 	
-	return df
\ No newline at end of file
+	return df
+
+
+@st.cache_data
+def load_votation_results():
+	"""
+	Compute the per-vote results of every votation once, to be reused by
+	topic-scoped analyses.
+	
+	Returns:
+		pd.DataFrame: Per-vote loyalty, officialism and attendance flags
+	"""
+	return get_votation_results()
+
+
+@st.cache_data
+def load_topic_analysis(topic):
+	"""
+	Analysis restricted to the votations whose title matches the topic.
+	
+	Args:
+		topic (str): Words to search for in the votation titles
+		
+	Returns:
+		tuple: (flattened analysis DataFrame, number of matching votations)
+	"""
+	df_topic, votations_count = analyze_topic(topic, load_votation_results())
+	return df_topic.reset_index(), votations_count
+
+
+@st.cache_data
+def load_coalitions():
+	"""
+	Detect the coalitions formed on the floor and compare them with the
+	official blocks.
+	
+	Returns:
+		tuple: (per-deputy communities, per-community summary, adjusted Rand index)
+	"""
+	from src.processing.network import find_coalitions, compare_with_blocks
+
+	coalitions_df = find_coalitions(get_votes_history())
+	summary_df, _, ari = compare_with_blocks(coalitions_df)
+	return coalitions_df, summary_df, ari
+
+
+@st.cache_data
+def load_block_alignment():
+	"""
+	Compute how often every pair of blocks votes together, per month.
+	
+	Returns:
+		BlockAlignment: Fitted alignment engine
+	"""
+	from src.processing.alignment import BlockAlignment
+
+	return BlockAlignment(freq='M').fit(get_votes_history())
+
+
+@st.cache_resource(ttl=600)
+def load_deputy_timelines():
+	"""
+	Load the per-deputy timelines exported by the analysis stage, rebuilding
+	them when they don't cover every loaded votation. Cached as a resource
+	so profile views read the shared arrays without copying them.
+	
+	Returns:
+		DeputyTimelines: Timelines of every deputy
+	"""
+	loaded_ids = set(get_votations_metadata().query('loaded').index)
+
+	if DEPUTY_TIMELINES_PATH.exists():
+		timelines = DeputyTimelines.load(DEPUTY_TIMELINES_PATH)
+		if loaded_ids <= timelines.seen_ids:
+			return timelines
+
+	timelines = build_deputy_timelines()
+	DEPUTY_TIMELINES_PATH.parent.mkdir(parents=True, exist_ok=True)
+	timelines.save(DEPUTY_TIMELINES_PATH)
+	return timelines
+
+
+@st.cache_data(ttl=600)
+def load_last_update_changes():
+	"""
+	Compare the analysis snapshots of the last two ingest runs.
+	
+	Returns:
+		tuple: (per-deputy changes, snapshot summary), or None before the second run
+	"""
+	return get_last_update_changes()
+
+
+@st.cache_resource
+def get_prediction_model():
+	"""
+	Create the prediction model shared by all sessions.
+	
+	Returns:
+		VotationPredictor: Empty model, trained by load_prediction_model
+	"""
+	return VotationPredictor()
+
+
+# Serializes updates of the shared models across concurrent sessions
+_model_lock = threading.Lock()
+
+
+def _update_model(model, name):
+	"""
+	Feed a shared incremental model the votations it hasn't seen yet.
+	
+	Args:
+		model: Model exposing seen_ids and partial_fit
+		name (str): Model name used in log messages
+		
+	Returns:
+		bool: True if the model was updated
+	"""
+	with _model_lock:
+		new_votes = get_votes_history(exclude_ids=model.seen_ids)
+		
+		if new_votes.empty:
+			return False
+
+		if hasattr(model, 'requires_refit') and model.requires_refit(new_votes):
+			# Actas older than the ones already seen: walk forward again from the start
+			print(f"Retraining {name} on the whole history...")
+			model.fit(get_votes_history())
+		else:
+			print(f"Training {name} with {new_votes['vote_id'].nunique()} new votations...")
+			model.partial_fit(new_votes)
+
+	return True
+
+
+def load_prediction_model():
+	"""
+	Return the shared prediction model, updated incrementally with the
+	votations added to the database since the last call.
+	
+	Returns:
+		VotationPredictor: Model trained on every loaded votation
+	"""
+	model = get_prediction_model()
+	_update_model(model, "prediction model")
+	
+	return model
+
+
+@st.cache_resource
+def get_ideal_point_model():
+	"""
+	Create the ideal point model shared by all sessions, starting from the
+	embeddings cached on disk when they belong to the current database.
+	
+	Returns:
+		IdealPointModel: Model updated by load_ideal_points
+	"""
+	from src.processing.scaling import IdealPointModel
+
+	if IDEAL_POINTS_PATH.exists():
+		model = IdealPointModel.load(IDEAL_POINTS_PATH)
+		if model.seen_ids <= set(get_votations_metadata().index):
+			return model
+	return IdealPointModel()
+
+
+def load_ideal_points(min_votes=1):
+	"""
+	Return the ideal point of every deputy, folding in the votations added
+	since the last call and refreshing the embeddings cached on disk.
+	
+	Args:
+		min_votes (int): Minimum number of votes for a deputy to be included
+		
+	Returns:
+		pd.DataFrame: Columns deputy, block, votes, dim_1 and dim_2
+	"""
+	model = get_ideal_point_model()
+
+	if _update_model(model, "ideal point model"):
+		IDEAL_POINTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+		model.save(IDEAL_POINTS_PATH)
+
+	return model.embeddings(min_votes=min_votes)
@@ -1,11 +1,14 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
-DATABASE_URL = "sqlite:///./data/congreso.db"
+# Can be overridden to point the application at another database (e.g. benchmarks)
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./data/congreso.db")
 
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert
 from typing import List, Dict, Any
 
-from src.database.models import VotationMetadata
+from src.database.models import VotationMetadata, DeputiesVoting
+from src.database.search import index_votation_titles
 
 def save_votation_metadata(db: Session, votation_metadata: List[Dict[str, Any]]) -> int:
 	"""
@@ -31,8 +33,46 @@ def save_votation_metadata(db: Session, votation_metadata: List[Dict[str, Any]])
 	new_votations_objects = [VotationMetadata(**data) for data in new_data_to_add]
 
 	db.add_all(new_votations_objects)
+	# Keep the full-text title index in sync in the same transaction
+	index_votation_titles(db, new_data_to_add)
 	db.commit()
 
 	num_added = len(new_votations_objects)
 
-	return num_added
\ No newline at end of file
+	return num_added
+
+def upsert_deputies_votes(db: Session, deputies_votes: List[Dict[str, Any]], batch_size: int = 500) -> int:
+	"""
+	Inserts deputy votes, updating block, province and vote of the rows that
+	already exist for the same (vote_id, deputy). Running it twice with the
+	same data leaves the table unchanged. The caller commits the session.
+	Args:
+		db (Session): Database session.
+		deputies_votes (List[Dict[str, Any]]): Rows with keys vote_id, deputy, block, province and vote.
+		batch_size (int): Rows per INSERT statement.
+	Returns:
+		int: Number of rows inserted or updated.
+	"""
+	columns = ('vote_id', 'deputy', 'block', 'province', 'vote')
+
+	# Keep the last row of each (vote_id, deputy) so a batch never conflicts with itself
+	unique_rows = {
+		(data['vote_id'], data['deputy']): {column: data.get(column) for column in columns}
+		for data in deputies_votes
+	}
+	rows = list(unique_rows.values())
+
+	written = 0
+	for start in range(0, len(rows), batch_size):
+		statement = insert(DeputiesVoting).values(rows[start:start + batch_size])
+		statement = statement.on_conflict_do_update(
+			index_elements=['vote_id', 'deputy'],
+			set_={
+				'block': statement.excluded.block,
+				'province': statement.excluded.province,
+				'vote': statement.excluded.vote,
+			}
+		)
+		written += db.execute(statement).rowcount
+
+	return written
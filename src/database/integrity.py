@@ -0,0 +1,149 @@
+import unicodedata
+from typing import Dict, Optional
+
+import pandas as pd
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from src.database.models import DeputiesVoting, VotationMetadata, ScrapeJob
+from src.database.jobs import PENDING
+from src.processing.analyzer import VOTE_CATEGORIES
+
+CREATE_UNIQUE_VOTE_INDEX_SQL = (
+	"CREATE UNIQUE INDEX IF NOT EXISTS ux_deputies_votes_vote_deputy "
+	"ON deputies_votes (vote_id, deputy)"
+)
+
+def _strip_accents(value: str) -> str:
+	return ''.join(c for c in unicodedata.normalize('NFKD', value) if not unicodedata.combining(c))
+
+# Known vote values indexed by their accent-free, upper-case spelling
+_CANONICAL_VOTES = {_strip_accents(vote): vote for vote in VOTE_CATEGORIES}
+
+def normalize_vote(value: Optional[str]) -> Optional[str]:
+	"""
+	Maps a scraped vote to its known spelling ignoring case, accents and
+	surrounding spaces. Returns None when it doesn't match any known value.
+	"""
+	if value is None:
+		return None
+	return _CANONICAL_VOTES.get(_strip_accents(' '.join(value.split()).upper()))
+
+def check_integrity(db: Session, expected_deputies: Optional[Dict[str, int]] = None, tolerance: float = 0.05) -> Dict[str, pd.DataFrame]:
+	"""
+	Scans deputies_votes in a single read for duplicated (vote_id, deputy)
+	rows, vote values outside the known categories and actas whose number
+	of deputies is implausible for their chamber.
+	Args:
+		db (Session): Database session.
+		expected_deputies (Dict[str, int], optional): Deputies expected in each
+			acta by chamber. Chambers left out default to their most common
+			count across actas.
+		tolerance (float): Allowed relative deviation from the expected count.
+	Returns:
+		Dict[str, pd.DataFrame]: 'duplicates' (every row of a duplicated pair),
+			'unknown_votes' (rows with their suggested value, None if unknown)
+			and 'implausible_actas' (vote_id with its chamber, deputy count and
+			expected count).
+	"""
+	votes_df = pd.read_sql(
+		text(
+			"SELECT dv.id, dv.vote_id, dv.deputy, dv.vote, COALESCE(vm.chamber, 'diputados') AS chamber "
+			"FROM deputies_votes dv LEFT JOIN votation_metadata vm ON vm.id = dv.vote_id"
+		),
+		db.bind
+	)
+
+	duplicated = votes_df.duplicated(['vote_id', 'deputy'], keep=False)
+	duplicates_df = votes_df[duplicated].sort_values(['vote_id', 'deputy', 'id'])
+
+	unknown = ~votes_df['vote'].isin(VOTE_CATEGORIES)
+	unknown_df = votes_df[unknown].copy()
+	unknown_df['normalized_vote'] = unknown_df['vote'].map(normalize_vote)
+
+	# Count each deputy once so duplicates don't also flag the acta
+	deputy_counts = votes_df.drop_duplicates(['vote_id', 'deputy']).groupby(['chamber', 'vote_id']).size()
+	deputy_counts = deputy_counts.rename('deputies').reset_index()
+
+	# Chambers differ in size (257 deputies, 72 senators): compare each acta with its own chamber
+	expected = deputy_counts.groupby('chamber')['deputies'].agg(lambda counts: int(counts.mode().max()))
+	expected.update(pd.Series(expected_deputies or {}, dtype='int64'))
+	deputy_counts['expected'] = deputy_counts['chamber'].map(expected).fillna(0).astype('int64')
+
+	deviation = (deputy_counts['deputies'] - deputy_counts['expected']).abs() / deputy_counts['expected']
+	implausible_df = deputy_counts[(deputy_counts['expected'] > 0) & (deviation > tolerance)]
+
+	return {
+		'duplicates': duplicates_df,
+		'unknown_votes': unknown_df,
+		'implausible_actas': implausible_df,
+	}
+
+def repair_integrity(db: Session, report: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, int]:
+	"""
+	Repairs the problems found by check_integrity in a single transaction:
+	keeps only the most recently scraped row of each duplicated pair,
+	rewrites unknown votes that only differ in case or accents, and queues
+	implausible actas to be scraped again. Finally creates the unique index
+	on (vote_id, deputy) so duplicates can't come back.
+	Args:
+		db (Session): Database session.
+		report (Dict[str, pd.DataFrame], optional): Output of check_integrity.
+	Returns:
+		Dict[str, int]: Number of rows deleted, votes normalized and actas re-queued.
+	"""
+	if report is None:
+		report = check_integrity(db)
+
+	duplicates_df = report['duplicates']
+	latest_ids = duplicates_df.groupby(['vote_id', 'deputy'])['id'].transform('max')
+	stale_ids = duplicates_df.loc[duplicates_df['id'] != latest_ids, 'id'].tolist()
+	deleted = 0
+	for start in range(0, len(stale_ids), 500):
+		deleted += db.query(DeputiesVoting).filter(
+			DeputiesVoting.id.in_(stale_ids[start:start + 500])
+		).delete(synchronize_session=False)
+
+	fixable_df = report['unknown_votes'].dropna(subset=['normalized_vote'])
+	normalized = 0
+	for normalized_vote, rows in fixable_df.groupby('normalized_vote'):
+		normalized += db.execute(
+			update(DeputiesVoting)
+			.where(DeputiesVoting.id.in_(rows['id'].tolist()))
+			.values(vote=normalized_vote)
+		).rowcount
+
+	acta_ids = report['implausible_actas']['vote_id'].tolist()
+	if acta_ids:
+		db.execute(update(VotationMetadata).where(VotationMetadata.id.in_(acta_ids)).values(loaded=False))
+		db.execute(
+			update(ScrapeJob)
+			.where(ScrapeJob.votation_id.in_(acta_ids))
+			.values(status=PENDING, next_retry_at=None, attempts=0)
+		)
+
+	db.execute(text(CREATE_UNIQUE_VOTE_INDEX_SQL))
+	db.commit()
+
+	return {'deleted': deleted, 'normalized': normalized, 'requeued': len(acta_ids)}
+
+def ensure_unique_vote_index(db: Session) -> None:
+	"""
+	Creates the unique (vote_id, deputy) index on databases created before
+	it existed, removing duplicated rows first if there are any.
+	Args:
+		db (Session): Database session.
+	"""
+	exists = db.execute(text(
+		"SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_deputies_votes_vote_deputy'"
+	)).first()
+	if exists:
+		return
+
+	report = check_integrity(db)
+	# Only duplicates block the index; other findings are left for an explicit repair
+	repair_integrity(db, {
+		'duplicates': report['duplicates'],
+		'unknown_votes': report['unknown_votes'].iloc[0:0],
+		'implausible_actas': report['implausible_actas'].iloc[0:0],
+	})
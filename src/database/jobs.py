@@ -0,0 +1,203 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from src.database.models import ScrapeJob, VotationMetadata
+
+# Job states
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+def enqueue_votations(db: Session, votation_ids: Iterable[str]) -> int:
+	"""
+	Creates a pending fetch job for every votation that doesn't have one yet.
+	Args:
+		db (Session): Database session.
+		votation_ids (Iterable[str]): IDs of the votations to fetch.
+	Returns:
+		int: Number of jobs created.
+	"""
+	incoming_ids = set(votation_ids)
+	if not incoming_ids:
+		return 0
+
+	existing_ids_query = db.query(ScrapeJob.votation_id).filter(ScrapeJob.votation_id.in_(incoming_ids))
+	existing_ids = {id_tuple[0] for id_tuple in existing_ids_query}
+
+	new_jobs = [ScrapeJob(votation_id=votation_id, status=PENDING, attempts=0) for votation_id in incoming_ids - existing_ids]
+	if not new_jobs:
+		return 0
+
+	db.add_all(new_jobs)
+	db.commit()
+
+	return len(new_jobs)
+
+def enqueue_unloaded_votations(db: Session) -> int:
+	"""
+	Creates jobs for the votations whose votes haven't been loaded yet, and
+	puts back in the queue any finished job whose votation is still not loaded.
+	Args:
+		db (Session): Database session.
+	Returns:
+		int: Number of jobs created or re-queued.
+	"""
+	unloaded_ids = {row.id for row in db.query(VotationMetadata.id).filter(VotationMetadata.loaded == False)}
+	if not unloaded_ids:
+		return 0
+
+	requeued = db.execute(
+		update(ScrapeJob)
+		.where(ScrapeJob.votation_id.in_(unloaded_ids), ScrapeJob.status == DONE)
+		.values(status=PENDING, next_retry_at=None)
+	).rowcount
+	db.commit()
+
+	return requeued + enqueue_votations(db, unloaded_ids)
+
+def _due_condition(now: datetime):
+	"""Jobs that may be leased at `now`: due pending jobs or expired leases."""
+	return or_(
+		and_(ScrapeJob.status == PENDING, or_(ScrapeJob.next_retry_at == None, ScrapeJob.next_retry_at <= now)),
+		and_(ScrapeJob.status == LEASED, ScrapeJob.leased_until < now),
+	)
+
+def lease_job(
+	db: Session, worker: str, lease_seconds: int = 300, now: Optional[datetime] = None, chamber: Optional[str] = None
+) -> Optional[ScrapeJob]:
+	"""
+	Atomically claims the next due job for a worker. A lease that is not
+	completed or failed before it expires can be claimed by another worker.
+	Args:
+		db (Session): Database session.
+		worker (str): Name of the worker claiming the job.
+		lease_seconds (int): Duration of the lease.
+		now (datetime, optional): Current time, mainly for testing.
+		chamber (str, optional): Only claim jobs of votations of this chamber.
+	Returns:
+		Optional[ScrapeJob]: The leased job, or None when no job is due.
+	"""
+	now = now or datetime.now()
+
+	while True:
+		candidates = db.query(ScrapeJob.id).filter(_due_condition(now))
+		if chamber is not None:
+			candidates = candidates.join(VotationMetadata, VotationMetadata.id == ScrapeJob.votation_id).filter(
+				VotationMetadata.chamber == chamber
+			)
+		candidate = candidates.order_by(
+			ScrapeJob.next_retry_at.is_not(None), ScrapeJob.next_retry_at, ScrapeJob.id
+		).first()
+		if candidate is None:
+			return None
+
+		# The due condition is re-checked so two workers can't claim the same job
+		claimed = db.execute(
+			update(ScrapeJob)
+			.where(ScrapeJob.id == candidate.id, _due_condition(now))
+			.values(
+				status=LEASED,
+				lease_owner=worker,
+				leased_until=now + timedelta(seconds=lease_seconds),
+				attempts=ScrapeJob.attempts + 1,
+			)
+		).rowcount
+		db.commit()
+
+		if claimed:
+			return db.get(ScrapeJob, candidate.id)
+
+def complete_job(db: Session, job: ScrapeJob, content_hash: str, now: Optional[datetime] = None) -> None:
+	"""
+	Marks a leased job as done and records the hash of the fetched content.
+	Args:
+		db (Session): Database session.
+		job (ScrapeJob): The leased job.
+		content_hash (str): Hash of the parsed acta.
+		now (datetime, optional): Current time, mainly for testing.
+	"""
+	job.status = DONE
+	job.attempts = 0
+	job.last_error = None
+	job.next_retry_at = None
+	job.lease_owner = None
+	job.leased_until = None
+	job.content_hash = content_hash
+	job.verified_at = now or datetime.now()
+	db.commit()
+
+def fail_job(
+	db: Session,
+	job: ScrapeJob,
+	error: str,
+	max_attempts: int = 5,
+	base_delay: int = 60,
+	max_delay: int = 6 * 3600,
+	now: Optional[datetime] = None
+) -> None:
+	"""
+	Records a failed attempt. The job is retried with exponential backoff
+	until it reaches max_attempts, after which it is marked as failed.
+	Args:
+		db (Session): Database session.
+		job (ScrapeJob): The leased job.
+		error (str): Description of the error.
+		max_attempts (int): Attempts before giving up.
+		base_delay (int): Delay in seconds before the first retry.
+		max_delay (int): Upper bound for the retry delay in seconds.
+		now (datetime, optional): Current time, mainly for testing.
+	"""
+	now = now or datetime.now()
+
+	job.last_error = error
+	job.lease_owner = None
+	job.leased_until = None
+
+	if job.attempts >= max_attempts:
+		job.status = FAILED
+		job.next_retry_at = None
+	else:
+		delay = min(base_delay * 2 ** (job.attempts - 1), max_delay)
+		job.status = PENDING
+		job.next_retry_at = now + timedelta(seconds=delay)
+
+	db.commit()
+
+def schedule_reverification(
+	db: Session,
+	recent_days: int = 30,
+	min_interval: timedelta = timedelta(hours=24),
+	now: Optional[datetime] = None
+) -> int:
+	"""
+	Re-queues the finished jobs of recent votations so their actas are fetched
+	again and compared against the stored content hash.
+	Args:
+		db (Session): Database session.
+		recent_days (int): Only votations held in the last recent_days are checked.
+		min_interval (timedelta): Minimum time between two verifications of an acta.
+		now (datetime, optional): Current time, mainly for testing.
+	Returns:
+		int: Number of jobs re-queued.
+	"""
+	now = now or datetime.now()
+
+	recent_ids = db.query(VotationMetadata.id).filter(VotationMetadata.date >= (now - timedelta(days=recent_days)).date())
+
+	requeued = db.execute(
+		update(ScrapeJob)
+		.where(
+			ScrapeJob.status == DONE,
+			ScrapeJob.votation_id.in_(recent_ids.scalar_subquery()),
+			or_(ScrapeJob.verified_at == None, ScrapeJob.verified_at < now - min_interval),
+		)
+		.values(status=PENDING, next_retry_at=None, attempts=0)
+		.execution_options(synchronize_session=False)
+	).rowcount
+	db.commit()
+
+	return requeued
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index
 from .connections import Base
 
 class VotationMetadata(Base):
     __tablename__ = 'votation_metadata'
     
     id = Column(String, primary_key=True, index=True)
+    # Source chamber (see src.scraping.sources); IDs of other chambers than Diputados are prefixed with it
+    chamber = Column(String, default='diputados', server_default='diputados', index=True)
     date = Column(Date)
     title = Column(String)
     type = Column(String)
@@ -14,10 +16,63 @@ class VotationMetadata(Base):
 
 class DeputiesVoting(Base):
     __tablename__ = 'deputies_votes'
+    __table_args__ = (
+        # A deputy votes once per votation; required by the bulk upsert
+        Index('ux_deputies_votes_vote_deputy', 'vote_id', 'deputy', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     vote_id = Column(String, ForeignKey('votation_metadata.id'))
     deputy = Column(String)
     block = Column(String)
     province = Column(String)
-    vote = Column(String)
\ No newline at end of file
+    vote = Column(String)
+
+class ScrapeJob(Base):
+    __tablename__ = 'scrape_jobs'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    votation_id = Column(String, ForeignKey('votation_metadata.id'), unique=True, index=True)
+    status = Column(String, default='pending', index=True)
+    attempts = Column(Integer, default=0)
+    last_error = Column(String, nullable=True)
+    next_retry_at = Column(DateTime, nullable=True)
+    lease_owner = Column(String, nullable=True)
+    leased_until = Column(DateTime, nullable=True)
+    content_hash = Column(String, nullable=True)
+    verified_at = Column(DateTime, nullable=True)
+
+class AnalysisSnapshot(Base):
+    __tablename__ = 'analysis_snapshots'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_at = Column(DateTime, index=True)
+    votations = Column(Integer)
+    added = Column(Integer)
+    # True when the counts were recomputed from scratch (e.g. after a corrected acta)
+    full_recompute = Column(Boolean, default=False)
+
+class SnapshotVotation(Base):
+    __tablename__ = 'analysis_snapshot_votations'
+    
+    # Votations added (or corrected) by each snapshot, with the acta hash they were counted with
+    snapshot_id = Column(Integer, ForeignKey('analysis_snapshots.id'), primary_key=True)
+    votation_id = Column(String, ForeignKey('votation_metadata.id'), primary_key=True)
+    content_hash = Column(String, nullable=True)
+
+class SnapshotCount(Base):
+    __tablename__ = 'analysis_snapshot_counts'
+    
+    # Additive per-deputy counters (ACCUMULATOR_COLUMNS): rates are ratios of two of them
+    snapshot_id = Column(Integer, ForeignKey('analysis_snapshots.id'), primary_key=True)
+    block = Column(String, primary_key=True)
+    deputy = Column(String, primary_key=True)
+    rows = Column(Integer)
+    participation = Column(Integer)
+    votes = Column(Integer)
+    loyalty = Column(Integer)
+    supported_officialism = Column(Integer)
+    accerted = Column(Integer)
+    absent = Column(Integer)
+    not_voted = Column(Integer)
+    abstention = Column(Integer)
@@ -0,0 +1,37 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.database.connections import Base, SessionLocal, engine
+from src.database import models  # noqa: F401 (registers the tables)
+from src.database.search import create_title_index
+
+def ensure_chamber_column(db: Session) -> None:
+	"""
+	Adds the votation_metadata.chamber column to databases created before
+	it existed; their votations all come from Diputados.
+	Args:
+		db (Session): Database session.
+	"""
+	columns = {row.name for row in db.execute(text("PRAGMA table_info(votation_metadata)"))}
+	if not columns or 'chamber' in columns:
+		return
+
+	db.execute(text("ALTER TABLE votation_metadata ADD COLUMN chamber VARCHAR DEFAULT 'diputados'"))
+	db.execute(text("CREATE INDEX IF NOT EXISTS ix_votation_metadata_chamber ON votation_metadata (chamber)"))
+	db.commit()
+
+def upgrade_schema() -> None:
+	"""
+	Brings the database to the current schema: creates the missing tables,
+	adds the columns that databases created by older versions lack and
+	builds the full-text title index, adding the votations not indexed yet.
+	Called explicitly by the entry points (main.py, app.py), never on import.
+	"""
+	Base.metadata.create_all(bind=engine)
+
+	db = SessionLocal()
+	try:
+		ensure_chamber_column(db)
+		create_title_index(db)
+	finally:
+		db.close()
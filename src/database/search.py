@@ -0,0 +1,95 @@
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# FTS5 index over votation titles. Diacritics are removed so that
+# "jubilacion" matches "JUBILACIÓN".
+CREATE_TITLE_INDEX_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS votation_titles USING fts5(
+	vote_id UNINDEXED,
+	title,
+	tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+def title_index_exists(db: Session) -> bool:
+	"""
+	Checks whether the full-text index has been created.
+	Args:
+		db (Session): Database session.
+	Returns:
+		bool: True if the votation_titles table exists.
+	"""
+	return db.execute(text(
+		"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'votation_titles'"
+	)).first() is not None
+
+def create_title_index(db: Session) -> None:
+	"""
+	Creates the full-text index if needed and adds the votations that are
+	not indexed yet.
+	Args:
+		db (Session): Database session.
+	"""
+	db.execute(text(CREATE_TITLE_INDEX_SQL))
+	db.execute(text(
+		"INSERT INTO votation_titles (vote_id, title) "
+		"SELECT id, COALESCE(title, '') FROM votation_metadata "
+		"WHERE id NOT IN (SELECT vote_id FROM votation_titles)"
+	))
+	db.commit()
+
+def index_votation_titles(db: Session, votation_metadata: List[Dict[str, Any]]) -> None:
+	"""
+	Adds the titles of new votations to the full-text index. The caller
+	commits the session, unless the index is being created for the first time.
+	Args:
+		db (Session): Database session.
+		votation_metadata (List[Dict[str, Any]]): Votation metadata dictionaries with id and title.
+	"""
+	if not title_index_exists(db):
+		# First use: build the index from every stored votation, new ones included
+		db.flush()
+		create_title_index(db)
+		return
+
+	db.execute(
+		text("INSERT INTO votation_titles (vote_id, title) VALUES (:vote_id, :title)"),
+		[{'vote_id': data['id'], 'title': data.get('title') or ''} for data in votation_metadata]
+	)
+
+def build_match_query(query: str) -> str:
+	"""
+	Converts free text into an FTS5 expression where every word must appear,
+	matching words that start with it. FTS5 operators typed by the user are
+	treated as plain words.
+	Args:
+		query (str): Free text typed by the user.
+	Returns:
+		str: FTS5 MATCH expression, empty if the text has no words.
+	"""
+	words = re.findall(r'\w+', query)
+	return ' AND '.join(f'"{word}"*' for word in words)
+
+def search_votations(db: Session, query: str) -> List[str]:
+	"""
+	Returns the IDs of the votations whose title matches the query (none
+	if the full-text index hasn't been created by upgrade_schema yet).
+	Args:
+		db (Session): Database session.
+		query (str): Free text typed by the user.
+	Returns:
+		List[str]: Matching votation IDs ordered by relevance.
+	"""
+	match_query = build_match_query(query)
+	# The index is built by upgrade_schema; searching never writes
+	if not match_query or not title_index_exists(db):
+		return []
+
+	rows = db.execute(
+		text("SELECT vote_id FROM votation_titles WHERE votation_titles MATCH :query ORDER BY rank"),
+		{'query': match_query}
+	)
+	return [row.vote_id for row in rows]
@@ -0,0 +1,266 @@
+"""
+Ingest Module
+
+This module scrapes votation metadata and deputy votes from the Cámara de
+Diputados website and stores them in the database. It is the only entry
+point that imports the scraping stack; the Streamlit application reads
+through `src.queries` instead.
+
+Each chamber is read through its source adapter (`src.scraping.sources`);
+several sources are ingested in parallel, each one with its own limit of
+concurrent downloads. Acta downloads go through the persistent job queue
+in `src.database.jobs`,
+so a failing acta is retried with backoff instead of stopping the run, and
+recent actas are periodically fetched again to detect corrections. Every
+run that writes votes ends with an analysis snapshot (`src.snapshots`).
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.scraping.sources import get_source, get_sources
+from src.database.crud import save_votation_metadata, upsert_deputies_votes
+from src.database.integrity import ensure_unique_vote_index
+from src.database.schema import ensure_chamber_column
+from src.snapshots import create_snapshot
+from src.queries import clear_category_dtypes
+from src.database.connections import SessionLocal, Base, engine
+from src.database.models import VotationMetadata, DeputiesVoting
+from src.database.jobs import (
+	enqueue_unloaded_votations, lease_job, complete_job, fail_job, schedule_reverification
+)
+
+
+def update_votation_metadata(year=2024, sources=None):
+	"""
+	Update the laws metadata by scraping the latest votation data of each
+	chamber source, fetching the lists of all sources in parallel.
+	
+	Args:
+		year (int): Year of the votations to search for
+		sources (list, optional): Chamber names or adapters (DEFAULT_SOURCES if None)
+		
+	Returns:
+		int: Number of new votations added to the database
+	"""
+	db = SessionLocal()
+	ensure_chamber_column(db)
+	db.close()
+
+	def update_source(source):
+		try:
+			new_law_list = source.list_votations(year)
+		except Exception as e:
+			print(f"Error listing {source.name} votations: {e}")
+			return 0
+
+		db = SessionLocal()
+		new_votation_count = save_votation_metadata(db, new_law_list)
+		db.close()
+
+		print(f"Added {new_votation_count} new {source.name} votations metadata to the database.")
+		return new_votation_count
+
+	sources = get_sources(sources)
+	with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+		return sum(executor.map(update_source, sources))
+
+
+def compute_content_hash(votation_data):
+	"""
+	Compute a stable hash of a parsed acta, independent of row order.
+	
+	Args:
+		votation_data (list): Rows returned by scrape_votation_data
+		
+	Returns:
+		str: SHA-256 hex digest
+	"""
+	rows = sorted(
+		(row['deputy'], row['block'], row['province'], row['vote'])
+		for row in votation_data
+	)
+	return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+# Largest share of an acta's stored deputies a correction may drop; a page
+# listing far fewer deputies is more likely broken than corrected
+MAX_REMOVED_DEPUTIES = 0.1
+
+
+def process_scrape_job(db, job, source, max_removed=MAX_REMOVED_DEPUTIES):
+	"""
+	Fetch the acta of a leased job and store its votes. When the acta was
+	already loaded and its content hash is unchanged nothing is written;
+	otherwise the votes are upserted on (vote_id, deputy), so re-running a
+	partially loaded acta never duplicates rows. Raises ValueError when the
+	acta has no votes or would drop too many stored deputies.
+	
+	Args:
+		db (Session): Database session
+		job (ScrapeJob): Leased job
+		source (TableSource): Adapter of the votation's chamber
+		max_removed (float): Largest share of the stored deputies that a
+			corrected acta may no longer list
+		
+	Returns:
+		bool: True if the stored votes were written or replaced
+	"""
+	votation_id = job.votation_id
+	print(f"Scraping data for votation {votation_id}...")
+	votation_data = source.scrape_votation_data(votation_id)
+	if not votation_data:
+		# A blank acta page (e.g. while the site is being updated) must not
+		# replace the stored votes: fail the job so it's retried later
+		raise ValueError(f"Votation {votation_id} page has no votes")
+
+	content_hash = compute_content_hash(votation_data)
+	votation = db.get(VotationMetadata, votation_id)
+
+	changed = not (votation.loaded and content_hash == job.content_hash)
+	if changed:
+		listed = {data['deputy'] for data in votation_data}
+		stored = {row.deputy for row in db.query(DeputiesVoting.deputy).filter(DeputiesVoting.vote_id == votation_id)}
+		removed = stored - listed
+		if stored and len(removed) > max_removed * len(stored):
+			raise ValueError(
+				f"Votation {votation_id} page drops {len(removed)} of {len(stored)} stored deputies"
+			)
+
+		print(f"Found {len(votation_data)} votes for votation {votation_id}.")
+		for data in votation_data:
+			data['vote_id'] = votation_id
+		upsert_deputies_votes(db, votation_data)
+
+		# Drop deputies that are no longer listed in a corrected acta
+		if removed:
+			db.query(DeputiesVoting).filter(
+				DeputiesVoting.vote_id == votation_id,
+				DeputiesVoting.deputy.in_(removed)
+			).delete(synchronize_session=False)
+
+		votation.loaded = True
+		db.flush()
+
+	complete_job(db, job, content_hash)
+
+	return changed
+
+
+def run_scrape_worker(worker, source=None, lease_seconds=300, max_attempts=5):
+	"""
+	Lease and process due jobs of a chamber until the queue has nothing
+	left to do now.
+	
+	Args:
+		worker (str): Worker name recorded in the job lease
+		source (TableSource, optional): Chamber adapter (Diputados if None)
+		lease_seconds (int): Duration of each lease
+		max_attempts (int): Attempts before a job is marked as failed
+		
+	Returns:
+		dict: Number of jobs written, unchanged and failed by this worker
+	"""
+	source = source or get_source('diputados')
+	stats = {'written': 0, 'unchanged': 0, 'failed': 0}
+	db = SessionLocal()
+
+	try:
+		while (job := lease_job(db, worker, lease_seconds, chamber=source.chamber)) is not None:
+			try:
+				changed = process_scrape_job(db, job, source)
+				stats['written' if changed else 'unchanged'] += 1
+			except Exception as e:
+				db.rollback()
+				print(f"Error scraping votation {job.votation_id} (attempt {job.attempts}): {e}")
+				fail_job(db, job, f"{type(e).__name__}: {e}", max_attempts=max_attempts)
+				stats['failed'] += 1
+	finally:
+		db.close()
+
+	return stats
+
+
+def update_votation_data(workers=None, sources=None):
+	"""
+	Queue every votation that hasn't been loaded yet and process the due
+	jobs of the scrape queue, including retries and re-verifications. The
+	sources run in parallel, each one with at most its max_concurrency
+	workers.
+	
+	Args:
+		workers (int, optional): Workers per source (capped by its max_concurrency;
+			max_concurrency if None)
+		sources (list, optional): Chamber names or adapters (DEFAULT_SOURCES if None)
+		
+	Returns:
+		dict: Number of jobs written, unchanged and failed, and the ID of
+			  the analysis snapshot taken after the run (None if nothing changed)
+	"""
+	db = SessionLocal()
+	ensure_chamber_column(db)
+	ensure_unique_vote_index(db)
+	queued = enqueue_unloaded_votations(db)
+	db.close()
+
+	if queued:
+		print(f"Queued {queued} votations for scraping.")
+
+	tasks = [
+		(f"{source.chamber}-worker-{i}", source)
+		for source in get_sources(sources)
+		for i in range(min(workers or source.max_concurrency, source.max_concurrency))
+	]
+	with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+		results = list(executor.map(lambda task: run_scrape_worker(*task), tasks))
+
+	stats = {key: sum(result[key] for result in results) for key in ('written', 'unchanged', 'failed')}
+	print(f"Votation data updated: {stats['written']} written, {stats['unchanged']} unchanged, {stats['failed']} failed.")
+
+	if stats['written']:
+		# New deputies, blocks or votes may have been stored
+		clear_category_dtypes()
+	stats['snapshot'] = create_snapshot() if stats['written'] else None
+	if stats['snapshot'] is not None:
+		print(f"Saved analysis snapshot {stats['snapshot']}.")
+
+	return stats
+
+
+def run_sync_daemon(interval_seconds=3600, workers=2, verify_days=30, iterations=None, sources=None):
+	"""
+	Keep the database current: periodically scrape new votation metadata,
+	re-verify the actas of recent votations and process the scrape queue.
+	
+	Args:
+		interval_seconds (int): Seconds to sleep between sync cycles
+		workers (int): Concurrent scrape workers per source (capped by its max_concurrency)
+		verify_days (int): Votations held in the last verify_days are re-verified
+		iterations (int, optional): Stop after this many cycles (runs forever if None)
+		sources (list, optional): Chamber names or adapters (DEFAULT_SOURCES if None)
+	"""
+	Base.metadata.create_all(bind=engine)
+	cycle = 0
+
+	while iterations is None or cycle < iterations:
+		cycle += 1
+		print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] Sync cycle {cycle}")
+
+		try:
+			update_votation_metadata(year=datetime.now().year, sources=sources)
+		except Exception as e:
+			print(f"Error updating votation metadata: {e}")
+
+		db = SessionLocal()
+		requeued = schedule_reverification(db, recent_days=verify_days)
+		db.close()
+		if requeued:
+			print(f"Re-verifying {requeued} recent votations.")
+
+		update_votation_data(workers=workers, sources=sources)
+
+		if iterations is None or cycle < iterations:
+			time.sleep(interval_seconds)
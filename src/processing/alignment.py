@@ -0,0 +1,169 @@
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+from src.processing.analyzer import get_officialism_block
+
+def get_block_positions(votes_df):
+	"""
+	Returns the majority position of every block in every votation as a
+	votation x block DataFrame: 1 when the block voted mostly AFIRMATIVO,
+	-1 when mostly NEGATIVO and 0 on ties or when it cast no vote.
+	"""
+	cast = votes_df[votes_df['vote'].isin(['AFIRMATIVO', 'NEGATIVO'])]
+	signed = np.where(cast['vote'] == 'AFIRMATIVO', 1, -1)
+
+	balance = pd.Series(signed, index=cast.index).groupby(
+		[cast['vote_id'], cast['block'].astype(object)]
+	).sum()
+
+	return np.sign(balance).unstack(fill_value=0).astype('int8')
+
+
+class BlockAlignment:
+	"""
+	Measures how often deputies and blocks align with the majority position
+	of every other block, computed for all votations in one vectorized pass.
+
+	Block-to-block results are stored as two compact int32 tensors of shape
+	(blocks, blocks, periods): `agreements[i, j, t]` counts the votations of
+	period t where blocks i and j took the same position, and `shared[i, j, t]`
+	those where both took a position. Rates for any pair and date range are
+	sums over the period axis, so they are answered without touching the votes.
+	"""
+
+	def __init__(self, freq='M'):
+		"""
+		Args:
+			freq (str): Pandas period frequency of the time axis.
+		"""
+		self.freq = freq
+		self.blocks = pd.Index([], name='block')
+		self.periods = pd.PeriodIndex([], freq=freq, name='period')
+		self.agreements = np.zeros((0, 0, 0), dtype='int32')
+		self.shared = np.zeros((0, 0, 0), dtype='int32')
+		self.deputy_agreements = pd.DataFrame()
+		self.deputy_shared = pd.DataFrame()
+		self.deputy_blocks = pd.Series(dtype=object, name='block')
+
+	def fit(self, votes_df, officialism_periods=None):
+		"""
+		Computes block and deputy alignment from the votes.
+
+		Args:
+			votes_df (pd.DataFrame): Votes with columns vote_id, date, deputy, block and vote.
+			officialism_periods (list, optional): (start, end, block) tuples
+				defining the officialism by date; defaults to OFFICIALISM_PERIODS.
+
+		Returns:
+			BlockAlignment: The fitted engine.
+		"""
+		positions = get_block_positions(votes_df)
+		dates = pd.to_datetime(votes_df.groupby('vote_id')['date'].first()).reindex(positions.index)
+
+		self.blocks = pd.Index(positions.columns, name='block')
+		self._fit_blocks(positions, dates)
+		self._fit_deputies(votes_df, positions, dates, officialism_periods)
+
+		return self
+
+	def _fit_blocks(self, positions, dates):
+		"""Fills the block x block x period tensors."""
+		period_codes, self.periods = pd.factorize(dates.dt.to_period(self.freq), sort=True)
+		self.periods = pd.PeriodIndex(self.periods, name='period')
+
+		in_period = np.zeros((len(positions), len(self.periods)), dtype='float32')
+		in_period[np.arange(len(positions)), period_codes] = 1
+
+		signed = positions.to_numpy(dtype='float32')
+		has_position = np.abs(signed)
+
+		# With positions +1/-1: products sum to agreements - disagreements
+		balance = np.einsum('vi,vj,vt->ijt', signed, signed, in_period, optimize=True)
+		self.shared = np.einsum('vi,vj,vt->ijt', has_position, has_position, in_period, optimize=True).astype('int32')
+		self.agreements = ((self.shared + balance) / 2).round().astype('int32')
+
+	def _fit_deputies(self, votes_df, positions, dates, officialism_periods):
+		"""Computes each deputy's agreement with every block and with the officialism."""
+		cast = votes_df[votes_df['vote'].isin(['AFIRMATIVO', 'NEGATIVO'])]
+		deputies = pd.Index(sorted(cast['deputy'].astype(object).unique()), name='deputy')
+
+		rows = deputies.get_indexer(cast['deputy'].astype(object))
+		cols = positions.index.get_indexer(cast['vote_id'])
+		signed = np.where(cast['vote'] == 'AFIRMATIVO', 1.0, -1.0)
+		deputy_positions = sparse.csr_matrix((signed, (rows, cols)), shape=(len(deputies), len(positions)))
+
+		# Officialism as an extra column: the position of the block that
+		# governed on the date of each votation
+		officialism = dates.map(lambda day: get_officialism_block(day, officialism_periods))
+		officialism_position = np.array([
+			positions.at[vote_id, block] if block in positions.columns else 0
+			for vote_id, block in officialism.items()
+		], dtype='float64')
+
+		targets = np.column_stack([positions.to_numpy(dtype='float64'), officialism_position])
+		balance = deputy_positions @ targets
+		shared = abs(deputy_positions) @ np.abs(targets)
+
+		columns = list(self.blocks) + ['officialism']
+		self.deputy_shared = pd.DataFrame(shared, index=deputies, columns=columns).astype('int32')
+		self.deputy_agreements = pd.DataFrame((shared + balance) / 2, index=deputies, columns=columns).round().astype('int32')
+		self.deputy_blocks = votes_df['block'].astype(object).groupby(votes_df['deputy'].astype(object)).last()
+
+	def _period_mask(self, start=None, end=None):
+		mask = np.ones(len(self.periods), dtype=bool)
+		if start is not None:
+			mask &= self.periods.end_time >= pd.Timestamp(start)
+		if end is not None:
+			mask &= self.periods.start_time <= pd.Timestamp(end)
+		return mask
+
+	def block_matrix(self, start=None, end=None, min_shared=1):
+		"""
+		Returns the block x block agreement rate between two dates (whole
+		periods overlapping the range are included).
+
+		Args:
+			start, end (date-like, optional): Date range.
+			min_shared (int): Pairs with fewer shared votations are NaN.
+
+		Returns:
+			pd.DataFrame: Agreement rate indexed and labelled by block.
+		"""
+		mask = self._period_mask(start, end)
+		agreements = self.agreements[:, :, mask].sum(axis=2)
+		shared = self.shared[:, :, mask].sum(axis=2)
+
+		with np.errstate(divide='ignore', invalid='ignore'):
+			rate = np.where(shared >= max(min_shared, 1), agreements / shared, np.nan)
+
+		return pd.DataFrame(rate, index=self.blocks, columns=self.blocks)
+
+	def pair_timeline(self, block_a, block_b):
+		"""
+		Returns the agreement of two blocks in each period.
+
+		Returns:
+			pd.DataFrame: Columns agreements, shared and rate indexed by period.
+		"""
+		i, j = self.blocks.get_loc(block_a), self.blocks.get_loc(block_b)
+		timeline = pd.DataFrame({
+			'agreements': self.agreements[i, j],
+			'shared': self.shared[i, j],
+		}, index=self.periods)
+		timeline['rate'] = timeline['agreements'] / timeline['shared'].where(timeline['shared'] > 0)
+
+		return timeline
+
+	def deputy_matrix(self, min_shared=1):
+		"""
+		Returns each deputy's agreement rate with every block's majority and
+		with the officialism (column 'officialism').
+
+		Returns:
+			pd.DataFrame: Rates indexed by deputy, plus the deputy's block.
+		"""
+		rate = self.deputy_agreements / self.deputy_shared.where(self.deputy_shared >= max(min_shared, 1))
+		rate.insert(0, 'block', self.deputy_blocks.reindex(rate.index))
+
+		return rate
@@ -1,5 +1,33 @@
 import pandas as pd
 import numpy as np
+from datetime import date
+
+# Block whose preference is used as the government position in each period,
+# as (first day, last day or None if ongoing, block name as scraped).
+# Periods must not overlap; add a row here when the government changes.
+OFFICIALISM_PERIODS = [
+	(date(2023, 12, 10), None, 'La Libertad Avanza'),
+]
+
+# Current officialism block
+OFFICIALISM_BLOCK = OFFICIALISM_PERIODS[-1][2]
+
+def get_officialism_block(votation_date, periods=None):
+	"""
+	Returns the officialism block on the given date, or None if no
+	configured period covers it.
+	"""
+	periods = OFFICIALISM_PERIODS if periods is None else periods
+	votation_date = pd.Timestamp(votation_date).date()
+
+	for start, end, block in periods:
+		if start <= votation_date and (end is None or votation_date <= end):
+			return block
+
+	return None
+
+# Every vote value stored by the scraper, in a stable order used for categoricals
+VOTE_CATEGORIES = ['AFIRMATIVO', 'NEGATIVO', 'ABSTENCION', 'SIN VOTAR', 'AUSENTE', 'PRESIDENTE', 'PENDIENTE DE INCORPORACIÓN']
 
 def get_blocks_data(votation_df):
     """
@@ -7,7 +35,8 @@ def get_blocks_data(votation_df):
 	Each entry contains the block name, the number of votes, and the counts of each voting preference.
 	Vote preference is determined by comparing the number of affirmative and negative votes
     """
-    counts_df = votation_df.groupby('block')['vote'].value_counts().unstack(fill_value=0)
+    counts_df = votation_df.groupby('block', observed=True)['vote'].value_counts().unstack(fill_value=0)
+    counts_df.columns = counts_df.columns.astype(object)
 
     vote_types = ['AFIRMATIVO', 'NEGATIVO', 'ABSTENCION', 'SIN VOTAR', 'AUSENTE']
     for v_type in vote_types:
@@ -31,22 +60,24 @@ def get_blocks_data(votation_df):
 
     return counts_df
 
-def determine_loyalty_votation(votation_df):
+def determine_loyalty_votation(votation_df, officialism_block=OFFICIALISM_BLOCK):
 	"""
 	Analyzes the votation data and returns a DataFrame with the results.
 	deputies_df: DataFrame with individual deputy voting behavior and loyalty.
+	officialism_block: Block whose preference is the government position.
 	"""
 
 	blocks_df = get_blocks_data(votation_df)
 
-	deputies_df = compare_block_deputies_preference(votation_df, blocks_df)    
+	deputies_df = compare_block_deputies_preference(votation_df, blocks_df, officialism_block)    
 	
 	return deputies_df
 
-def compare_block_deputies_preference(votation_df, blocks_df):
+def compare_block_deputies_preference(votation_df, blocks_df, officialism_block=OFFICIALISM_BLOCK):
 	"""
 	Analyzes votation data by merging block preferences with individual votes
-	and returns a DataFrame with all columns 
+	and returns a DataFrame with all columns. When the officialism block
+	didn't take part in the votation nobody is counted as supporting it.
 	"""
 	block_preferences = blocks_df[['preference']]
 
@@ -61,32 +92,34 @@ def compare_block_deputies_preference(votation_df, blocks_df):
 	# Loyalty
 	cond_loyal_afirmative = (merged_df['preference'] == 1) & (merged_df['vote'] == 'AFIRMATIVO')
 	cond_loyal_negative = (merged_df['preference'] == 0) & (merged_df['vote'] == 'NEGATIVO')
-	merged_df['loyalty'] = np.where(cond_loyal_afirmative | cond_loyal_negative, 1, 0)
+	merged_df['loyalty'] = cond_loyal_afirmative | cond_loyal_negative
     
       
 	# Prediction accuracy
-	votation_result = 1 if len(votation_df.loc[votation_df['vote'] == 'AFIRMATIVO']) > len(votation_df) else 0
+	affirmative_votes = (votation_df['vote'] == 'AFIRMATIVO').sum()
+	negative_votes = (votation_df['vote'] == 'NEGATIVO').sum()
+	votation_result = 1 if affirmative_votes > negative_votes else 0
 	accerted_afirmative = (votation_result == 1) & (merged_df['vote'] == 'AFIRMATIVO')
 	accerted_negative = (votation_result == 0) & (merged_df['vote'] == 'NEGATIVO')  
-	merged_df['accerted'] = np.where(accerted_afirmative | accerted_negative, 1, 0)
+	merged_df['accerted'] = accerted_afirmative | accerted_negative
     
 	# Officialism support calculation
-	officialism_preference = blocks_df.loc['La Libertad Avanza', 'preference']
+	officialism_preference = blocks_df['preference'].get(officialism_block, np.nan)
 	cond_loyal_officialism_affirmative = (officialism_preference == 1) & (merged_df['vote'] == 'AFIRMATIVO')
 	cond_loyal_officialism_negative = (officialism_preference == 0) & (merged_df['vote'] == 'NEGATIVO')
-	merged_df['supported_officialism'] = np.where(cond_loyal_officialism_affirmative | cond_loyal_officialism_negative, 1, 0) 
+	merged_df['supported_officialism'] = cond_loyal_officialism_affirmative | cond_loyal_officialism_negative 
       
 	# Ausentism
 	ausentism = merged_df['vote'] == 'AUSENTE'
-	merged_df['absent'] = np.where(ausentism, 1, 0)
+	merged_df['absent'] = ausentism
       
 	# Not voting
 	not_voting = merged_df['vote'] == 'SIN VOTAR'
-	merged_df['not_voted'] = np.where(not_voting, 1, 0)
+	merged_df['not_voted'] = not_voting
       
 	# Abstention
 	abstention = merged_df['vote'] == 'ABSTENCION'
-	merged_df['abstention'] = np.where(abstention, 1, 0)
+	merged_df['abstention'] = abstention
 
 	deputies_df = merged_df[['block', 'deputy', 'vote', 'loyalty', 'supported_officialism','accerted', 'absent', 'not_voted', 'abstention']]
 	deputies_df.set_index(['block', 'deputy'], inplace=True)
@@ -0,0 +1,316 @@
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+# Rows of the agreement matrix computed at once; bounds memory to
+# ROW_BLOCK_SIZE x number of deputies regardless of the chamber size
+ROW_BLOCK_SIZE = 1024
+
+def build_vote_indicators(votes_df, deputies):
+	"""
+	Builds sparse deputy x votation indicator matrices of AFIRMATIVO and
+	NEGATIVO votes.
+
+	Args:
+		votes_df (pd.DataFrame): Votes with columns vote_id, deputy and vote.
+		deputies (pd.Index): Row order.
+
+	Returns:
+		tuple: (affirmative csr_matrix, negative csr_matrix)
+	"""
+	column_codes, vote_ids = pd.factorize(votes_df['vote_id'])
+	rows = deputies.get_indexer(votes_df['deputy'].astype(object))
+	shape = (len(deputies), len(vote_ids))
+
+	def indicator(vote):
+		mask = (votes_df['vote'] == vote).to_numpy() & (rows >= 0)
+		return sparse.csr_matrix(
+			(np.ones(mask.sum(), dtype=np.float32), (rows[mask], column_codes[mask])),
+			shape=shape
+		)
+
+	return indicator('AFIRMATIVO'), indicator('NEGATIVO')
+
+def build_covoting_graph(votes_df, threshold=0.8, min_shared=None):
+	"""
+	Builds a weighted co-voting graph: two deputies are linked when they
+	voted the same way (AFIRMATIVO/NEGATIVO) in at least `threshold` of the
+	votations where both cast a vote, and they shared at least `min_shared`
+	such votations. The weight of the edge is the agreement rate.
+
+	Args:
+		votes_df (pd.DataFrame): Votes with columns vote_id, deputy and vote.
+		threshold (float): Minimum agreement rate to create an edge.
+		min_shared (int, optional): Minimum number of votations cast by both
+			deputies. Defaults to 10, or half the votations in short periods.
+
+	Returns:
+		tuple: (symmetric scipy.sparse.csr_matrix, pd.Index of deputies in row order)
+	"""
+	if min_shared is None:
+		min_shared = max(1, min(10, votes_df['vote_id'].nunique() // 2))
+
+	deputies = pd.Index(sorted(votes_df['deputy'].astype(object).unique()), name='deputy')
+	affirmative, negative = build_vote_indicators(votes_df, deputies)
+
+	# With positions +1/-1, position @ position.T = agreements - disagreements
+	# and cast @ cast.T = agreements + disagreements
+	position = (affirmative - negative).tocsr()
+	cast = (affirmative + negative).tocsr()
+	position_t, cast_t = position.T.tocsr(), cast.T.tocsr()
+
+	edge_rows, edge_cols, edge_weights = [], [], []
+	for start in range(0, len(deputies), ROW_BLOCK_SIZE):
+		end = min(start + ROW_BLOCK_SIZE, len(deputies))
+
+		# Dense row block times sparse matrix: the result is dense anyway
+		balance = np.asarray(position[start:end].toarray() @ position_t)
+		shared = np.asarray(cast[start:end].toarray() @ cast_t)
+
+		with np.errstate(divide='ignore', invalid='ignore'):
+			rate = np.where(shared > 0, (shared + balance) / (2 * shared), 0)
+
+		keep = (shared >= min_shared) & (rate >= threshold)
+		keep[np.arange(end - start), np.arange(start, end)] = False
+
+		rows, cols = np.nonzero(keep)
+		edge_rows.append(rows + start)
+		edge_cols.append(cols)
+		edge_weights.append(rate[rows, cols])
+
+	graph = sparse.csr_matrix(
+		(np.concatenate(edge_weights), (np.concatenate(edge_rows), np.concatenate(edge_cols))),
+		shape=(len(deputies), len(deputies))
+	)
+
+	return graph, deputies
+
+def modularity(graph, communities, resolution=1.0):
+	"""
+	Returns the modularity of a partition of a weighted undirected graph.
+
+	Args:
+		graph (scipy.sparse matrix): Symmetric adjacency matrix.
+		communities (np.ndarray): Community label of each node.
+		resolution (float): Resolution parameter.
+	"""
+	graph = sparse.csr_matrix(graph)
+	total = graph.sum()
+	if total == 0:
+		return 0.0
+
+	_, labels = np.unique(communities, return_inverse=True)
+	membership = sparse.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)))
+
+	internal = (membership.T @ graph @ membership).diagonal()
+	degrees = membership.T @ np.asarray(graph.sum(axis=1)).ravel()
+
+	return float((internal / total - resolution * (degrees / total) ** 2).sum())
+
+def _local_moves(graph, resolution, rng):
+	"""Louvain phase one: moves nodes to the neighbouring community with the best gain."""
+	n = graph.shape[0]
+	indptr, indices, weights = graph.indptr, graph.indices, graph.data
+
+	degrees = np.asarray(graph.sum(axis=1)).ravel()
+	total = degrees.sum()
+	community = np.arange(n)
+	community_degree = degrees.copy()
+
+	improved = True
+	moved_any = False
+	while improved:
+		improved = False
+		for node in rng.permutation(n):
+			neighbours = indices[indptr[node]:indptr[node + 1]]
+			links = weights[indptr[node]:indptr[node + 1]]
+			not_self = neighbours != node
+
+			current = community[node]
+			community_degree[current] -= degrees[node]
+
+			candidates, inverse = np.unique(community[neighbours[not_self]], return_inverse=True)
+			candidate_links = np.bincount(inverse, weights=links[not_self], minlength=len(candidates))
+
+			own_links = candidate_links[candidates == current].sum()
+			best, best_gain = current, own_links - resolution * community_degree[current] * degrees[node] / total
+			if len(candidates):
+				gains = candidate_links - resolution * community_degree[candidates] * degrees[node] / total
+				position = np.argmax(gains)
+				if gains[position] > best_gain + 1e-12:
+					best = candidates[position]
+
+			community[node] = best
+			community_degree[best] += degrees[node]
+			if best != current:
+				improved = True
+				moved_any = True
+
+	return community, moved_any
+
+def detect_communities(graph, resolution=1.0, seed=0, max_levels=20):
+	"""
+	Detects communities with the Louvain method: greedy local moves
+	followed by aggregation of each community into a single node, repeated
+	while modularity improves.
+
+	Args:
+		graph (scipy.sparse matrix): Symmetric weighted adjacency matrix.
+		resolution (float): Higher values produce smaller communities.
+		seed (int): Seed of the node visiting order.
+		max_levels (int): Maximum number of aggregation levels.
+
+	Returns:
+		np.ndarray: Community label (0..k-1, largest first) of each node.
+	"""
+	rng = np.random.default_rng(seed)
+	current = sparse.csr_matrix(graph, dtype=np.float64)
+	membership = np.arange(current.shape[0])
+
+	if current.sum() == 0:
+		return membership
+
+	for _ in range(max_levels):
+		community, moved = _local_moves(current, resolution, rng)
+		if not moved:
+			break
+
+		_, community = np.unique(community, return_inverse=True)
+		membership = community[membership]
+
+		aggregation = sparse.csr_matrix(
+			(np.ones(len(community)), (np.arange(len(community)), community))
+		)
+		current = sparse.csr_matrix(aggregation.T @ current @ aggregation)
+
+	# Relabel so community 0 is the largest
+	labels, membership, sizes = np.unique(membership, return_inverse=True, return_counts=True)
+	order = np.argsort(-sizes, kind='stable')
+	rank = np.empty_like(order)
+	rank[order] = np.arange(len(order))
+
+	return rank[membership]
+
+def find_coalitions(votes_df, threshold=0.8, min_shared=None, resolution=1.0, seed=0):
+	"""
+	Detects the coalitions formed on the floor in the given votes.
+
+	Args:
+		votes_df (pd.DataFrame): Votes with columns vote_id, deputy, block and vote,
+			in date order so the latest block of each deputy wins.
+		threshold, min_shared: See build_covoting_graph.
+		resolution, seed: See detect_communities.
+
+	Returns:
+		pd.DataFrame: Columns deputy, block, community and degree (number of
+			deputies the deputy is linked to).
+	"""
+	graph, deputies = build_covoting_graph(votes_df, threshold, min_shared)
+	communities = detect_communities(graph, resolution, seed)
+
+	latest_block = votes_df['block'].astype(object).groupby(votes_df['deputy'].astype(object)).last()
+
+	return pd.DataFrame({
+		'deputy': deputies,
+		'block': latest_block.reindex(deputies).to_numpy(),
+		'community': communities,
+		'degree': np.diff(graph.indptr),
+	})
+
+def coalitions_by_period(votes_df, freq='Q', **kwargs):
+	"""
+	Detects coalitions independently in each calendar period.
+
+	Args:
+		votes_df (pd.DataFrame): Votes with a date column.
+		freq (str): Pandas period frequency (e.g. 'Q', 'Y').
+		**kwargs: Passed to find_coalitions.
+
+	Returns:
+		pd.DataFrame: find_coalitions output with a period_start column.
+	"""
+	dates = pd.to_datetime(votes_df['date'])
+	periods = dates.dt.to_period(freq).dt.start_time
+
+	results = []
+	for period_start, period_votes in votes_df.groupby(periods.to_numpy(), sort=True):
+		coalitions_df = find_coalitions(period_votes, **kwargs)
+		coalitions_df.insert(0, 'period_start', period_start)
+		results.append(coalitions_df)
+
+	return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+
+def coalitions_sliding_windows(votes_df, window='180D', step='90D', **kwargs):
+	"""
+	Detects coalitions over overlapping time windows.
+
+	Args:
+		votes_df (pd.DataFrame): Votes with a date column.
+		window (str): Length of each window as a pandas timedelta string.
+		step (str): Distance between consecutive window starts.
+		**kwargs: Passed to find_coalitions.
+
+	Returns:
+		pd.DataFrame: find_coalitions output with window_start and window_end columns.
+	"""
+	dates = pd.to_datetime(votes_df['date'])
+	window, step = pd.Timedelta(window), pd.Timedelta(step)
+
+	results = []
+	window_start = dates.min()
+	while window_start <= dates.max():
+		window_end = window_start + window
+		in_window = ((dates >= window_start) & (dates < window_end)).to_numpy()
+		if in_window.any():
+			coalitions_df = find_coalitions(votes_df[in_window], **kwargs)
+			coalitions_df.insert(0, 'window_start', window_start)
+			coalitions_df.insert(1, 'window_end', window_end)
+			results.append(coalitions_df)
+		window_start += step
+
+	return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+
+def adjusted_rand_index(labels_a, labels_b):
+	"""Adjusted Rand index between two labelings (1 = identical partitions)."""
+	contingency = pd.crosstab(np.asarray(labels_a), np.asarray(labels_b)).to_numpy()
+
+	def pairs(values):
+		return (values * (values - 1) / 2).sum()
+
+	n = contingency.sum()
+	index = pairs(contingency)
+	expected = pairs(contingency.sum(axis=1)) * pairs(contingency.sum(axis=0)) / pairs(np.array([n]))
+	maximum = (pairs(contingency.sum(axis=1)) + pairs(contingency.sum(axis=0))) / 2
+
+	if maximum == expected:
+		return 1.0
+	return float((index - expected) / (maximum - expected))
+
+def compare_with_blocks(coalitions_df):
+	"""
+	Compares detected communities with the official blocks.
+
+	Args:
+		coalitions_df (pd.DataFrame): Output of find_coalitions.
+
+	Returns:
+		tuple: (summary pd.DataFrame with one row per community holding its
+				size, number of blocks, main block and the share of the
+				community belonging to it; composition crosstab of
+				community x block; adjusted Rand index between both partitions)
+	"""
+	composition = pd.crosstab(coalitions_df['community'], coalitions_df['block'])
+
+	summary = pd.DataFrame({
+		'size': composition.sum(axis=1),
+		'blocks': (composition > 0).sum(axis=1),
+		'main_block': composition.idxmax(axis=1),
+		'main_block_share': composition.max(axis=1) / composition.sum(axis=1),
+	})
+	summary['blocks_list'] = composition.apply(
+		lambda row: ', '.join(row[row > 0].sort_values(ascending=False).index), axis=1
+	)
+
+	ari = adjusted_rand_index(coalitions_df['community'], coalitions_df['block'])
+
+	return summary, composition, ari
@@ -0,0 +1,244 @@
+import pandas as pd
+import numpy as np
+
+CAST_VOTES = ['AFIRMATIVO', 'NEGATIVO']
+
+def get_votation_outcomes(votes_df):
+	"""
+	Returns a Series indexed by vote_id with the outcome of each votation:
+	1 when AFIRMATIVO votes outnumber NEGATIVO votes, 0 otherwise.
+	"""
+	affirmative = (votes_df['vote'] == 'AFIRMATIVO').groupby(votes_df['vote_id']).sum()
+	negative = (votes_df['vote'] == 'NEGATIVO').groupby(votes_df['vote_id']).sum()
+
+	outcomes = (affirmative > negative).astype(int)
+	outcomes.name = 'outcome'
+
+	return outcomes
+
+def get_block_preferences(votes_df):
+	"""
+	Returns a DataFrame with one row per (vote_id, block) holding the number
+	of seats the block had in the votation and its preference (1 when the
+	block voted mostly AFIRMATIVO). Blocks that cast no AFIRMATIVO/NEGATIVO
+	vote get a NaN preference.
+	"""
+	grouped = votes_df.assign(
+		affirmative=(votes_df['vote'] == 'AFIRMATIVO'),
+		negative=(votes_df['vote'] == 'NEGATIVO'),
+	).groupby(['vote_id', 'block'], sort=False, observed=True)
+
+	blocks_df = grouped.agg(
+		seats=('vote', 'size'),
+		affirmative=('affirmative', 'sum'),
+		negative=('negative', 'sum'),
+	).reset_index()
+
+	cast = (blocks_df['affirmative'] + blocks_df['negative']) > 0
+	blocks_df['preference'] = np.where(
+		cast,
+		(blocks_df['affirmative'] > blocks_df['negative']).astype(float),
+		np.nan
+	)
+
+	return blocks_df[['vote_id', 'block', 'seats', 'preference']]
+
+
+class VotationPredictor:
+	"""
+	Predicts the outcome of each votation from the historical preference of
+	every block weighted by its seat share, and backtests the predictive
+	accuracy of each deputy (how often their vote matched the final outcome).
+
+	The model only keeps cumulative counters, so `partial_fit` can be called
+	with the votes of new actas without reprocessing the history. Votations
+	are evaluated walk-forward: each one is predicted using only the
+	votations that came before it in date order. This only holds for actas
+	dated after every votation already seen; when older ones arrive (e.g.
+	an earlier year is ingested) `requires_refit` is True and the model
+	must be refitted on the whole history.
+	"""
+
+	def __init__(self, prior=0.5, prior_weight=1.0):
+		"""
+		Args:
+			prior (float): Prior probability that a block votes AFIRMATIVO.
+			prior_weight (float): Pseudo-count given to the prior.
+		"""
+		self.prior = prior
+		self.prior_weight = prior_weight
+
+		self.block_stats = pd.DataFrame(
+			{'affirmative_preferences': pd.Series(dtype=float), 'votations': pd.Series(dtype=float)}
+		).rename_axis('block')
+		self.deputy_stats = pd.DataFrame(
+			{'block': pd.Series(dtype=object), 'hits': pd.Series(dtype=int), 'votes': pd.Series(dtype=int)}
+		).rename_axis('deputy')
+		self.predictions = pd.DataFrame(
+			columns=['date', 'predicted_share', 'predicted', 'outcome', 'correct']
+		).rename_axis('vote_id')
+
+	@property
+	def seen_ids(self):
+		"""Set of votation IDs already incorporated into the model."""
+		return set(self.predictions.index)
+
+	def requires_refit(self, votes_df):
+		"""
+		Tells whether partial_fit with these votes would differ from fit on
+		the whole history, because some new votation is dated before the
+		latest votation already seen.
+
+		Args:
+			votes_df (pd.DataFrame): Votes with columns vote_id and date.
+
+		Returns:
+			bool: True if the model has to be refitted from scratch.
+		"""
+		new_votes = votes_df[~votes_df['vote_id'].isin(self.seen_ids)]
+		if new_votes.empty or self.predictions.empty:
+			return False
+		return pd.to_datetime(new_votes['date']).min() < pd.to_datetime(self.predictions['date']).max()
+
+	def fit(self, votes_df):
+		"""
+		Trains the model from scratch on the given votes.
+
+		Args:
+			votes_df (pd.DataFrame): Votes with columns vote_id, date, deputy, block and vote.
+
+		Returns:
+			VotationPredictor: The fitted model.
+		"""
+		self.__init__(self.prior, self.prior_weight)
+		return self.partial_fit(votes_df)
+
+	def partial_fit(self, votes_df):
+		"""
+		Incorporates the votes of votations not yet seen by the model.
+		Votations already included are ignored, so the full history can be
+		passed safely. Exact only for votations dated after those already
+		seen (see requires_refit).
+
+		Args:
+			votes_df (pd.DataFrame): Votes with columns vote_id, date, deputy, block and vote.
+
+		Returns:
+			VotationPredictor: The updated model.
+		"""
+		votes_df = votes_df[~votes_df['vote_id'].isin(self.seen_ids)]
+		if votes_df.empty:
+			return self
+
+		dates = votes_df.groupby('vote_id')['date'].first()
+		dates = pd.to_datetime(dates).sort_values(kind='stable')
+		order = pd.Series(np.arange(len(dates)), index=dates.index)
+
+		outcomes = get_votation_outcomes(votes_df)
+
+		self._predict_walk_forward(votes_df, order, dates, outcomes)
+		self._update_deputy_stats(votes_df, order, outcomes)
+
+		return self
+
+	def _predict_walk_forward(self, votes_df, order, dates, outcomes):
+		"""Predicts each new votation using only block preferences seen before it."""
+		blocks_df = get_block_preferences(votes_df)
+		blocks_df['order'] = blocks_df['vote_id'].map(order)
+		blocks_df = blocks_df.sort_values('order', kind='stable')
+
+		# Counters accumulated before each votation: previous batches plus
+		# the earlier votations of this batch (exclusive cumulative sum)
+		observed = blocks_df['preference'].notna().astype(float)
+		preference = blocks_df['preference'].fillna(0)
+		by_block = blocks_df['block']
+		previous_affirmative = preference.groupby(by_block, observed=True).cumsum() - preference
+		previous_votations = observed.groupby(by_block, observed=True).cumsum() - observed
+
+		base = self.block_stats.reindex(by_block).fillna(0)
+		previous_affirmative += base['affirmative_preferences'].to_numpy()
+		previous_votations += base['votations'].to_numpy()
+
+		blocks_df['p_affirmative'] = (
+			(previous_affirmative + self.prior * self.prior_weight)
+			/ (previous_votations + self.prior_weight)
+		)
+
+		seat_weighted = (blocks_df['p_affirmative'] * blocks_df['seats']).groupby(blocks_df['vote_id']).sum()
+		seats = blocks_df.groupby('vote_id')['seats'].sum()
+
+		new_predictions = pd.DataFrame({'date': dates})
+		new_predictions['predicted_share'] = (seat_weighted / seats).reindex(new_predictions.index)
+		new_predictions['predicted'] = (new_predictions['predicted_share'] > 0.5).astype(int)
+		new_predictions['outcome'] = outcomes.reindex(new_predictions.index)
+		new_predictions['correct'] = (new_predictions['predicted'] == new_predictions['outcome']).astype(int)
+		new_predictions.index.rename('vote_id', inplace=True)
+
+		self.predictions = pd.concat([self.predictions, new_predictions]) if len(self.predictions) else new_predictions
+
+		totals = pd.DataFrame({
+			'affirmative_preferences': preference.groupby(by_block, observed=True).sum(),
+			'votations': observed.groupby(by_block, observed=True).sum(),
+		})
+		self.block_stats = self.block_stats.add(totals, fill_value=0)
+
+	def _update_deputy_stats(self, votes_df, order, outcomes):
+		"""Adds the hits and cast votes of each deputy in the new votations."""
+		cast_df = votes_df[votes_df['vote'].isin(CAST_VOTES)]
+		hits = (cast_df['vote'] == 'AFIRMATIVO').astype(int) == cast_df['vote_id'].map(outcomes)
+
+		totals = pd.DataFrame({
+			'hits': hits.groupby(cast_df['deputy'], observed=True).sum(),
+			'votes': cast_df.groupby('deputy', observed=True).size(),
+		})
+		latest_block = votes_df.assign(order=votes_df['vote_id'].map(order)).sort_values(
+			'order', kind='stable'
+		).groupby('deputy', observed=True)['block'].last()
+
+		counters = self.deputy_stats[['hits', 'votes']].add(totals, fill_value=0).astype(int)
+		blocks = latest_block.combine_first(self.deputy_stats['block'])
+		self.deputy_stats = counters.assign(block=blocks.reindex(counters.index))[['block', 'hits', 'votes']]
+
+	def predict(self, votation_df):
+		"""
+		Predicts the outcome of a votation from its roster.
+
+		Args:
+			votation_df (pd.DataFrame): Roster with at least a 'block' column
+				(one row per deputy).
+
+		Returns:
+			tuple: (predicted affirmative share, predicted outcome as 0/1)
+		"""
+		seats = votation_df.groupby('block', observed=True).size()
+		stats = self.block_stats.reindex(seats.index).fillna(0)
+		p_affirmative = (
+			(stats['affirmative_preferences'] + self.prior * self.prior_weight)
+			/ (stats['votations'] + self.prior_weight)
+		)
+		share = float((p_affirmative * seats).sum() / seats.sum())
+
+		return share, int(share > 0.5)
+
+	def deputy_accuracy(self, min_votes=1):
+		"""
+		Returns the predictive accuracy of each deputy: the share of their
+		AFIRMATIVO/NEGATIVO votes that matched the final outcome.
+
+		Args:
+			min_votes (int): Minimum number of cast votes to be included.
+
+		Returns:
+			pd.DataFrame: Columns deputy, block, hits, votes and accuracy,
+				sorted by accuracy and votes.
+		"""
+		stats = self.deputy_stats[self.deputy_stats['votes'] >= min_votes].copy()
+		stats['accuracy'] = stats['hits'] / stats['votes']
+
+		return stats.reset_index().sort_values(by=['accuracy', 'votes'], ascending=False)
+
+	def model_accuracy(self):
+		"""Returns the walk-forward accuracy of the outcome predictions."""
+		if self.predictions.empty:
+			return float('nan')
+		return float(self.predictions['correct'].mean())
@@ -0,0 +1,220 @@
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import svds
+
+from src.processing.analyzer import OFFICIALISM_BLOCK
+
+# Numeric position of each vote. AUSENTE, SIN VOTAR and any other value are
+# treated as missing and left out of the matrix.
+VOTE_VALUES = {'AFIRMATIVO': 1.0, 'NEGATIVO': -1.0, 'ABSTENCION': 0.0}
+
+# Maximum number of new votations folded into the SVD at once
+UPDATE_BATCH_SIZE = 256
+
+def build_vote_matrix(votes_df, deputies):
+	"""
+	Builds the centered deputy x votation matrix as a sparse matrix.
+	Each votation is centered on the mean of its observed votes, so missing
+	entries (stored zeros) are equivalent to mean imputation.
+
+	Args:
+		votes_df (pd.DataFrame): Votes with columns vote_id, deputy and vote.
+		deputies (pd.Index): Row order; every deputy in votes_df must be in it.
+
+	Returns:
+		tuple: (scipy.sparse.csc_matrix, pd.Index of vote_ids in column order)
+	"""
+	observed = votes_df[votes_df['vote'].isin(list(VOTE_VALUES))]
+	values = observed['vote'].astype(object).map(VOTE_VALUES).astype(float)
+
+	column_codes, vote_ids = pd.factorize(observed['vote_id'])
+	centered = values - values.groupby(column_codes).transform('mean')
+
+	rows = deputies.get_indexer(observed['deputy'].astype(object))
+	matrix = sparse.csc_matrix(
+		(centered.to_numpy(), (rows, column_codes)),
+		shape=(len(deputies), len(vote_ids))
+	)
+
+	return matrix, pd.Index(vote_ids, name='vote_id')
+
+
+class IdealPointModel:
+	"""
+	Places every deputy on a few ideological dimensions using a truncated SVD
+	of the centered vote matrix.
+
+	The first `fit` computes a truncated SVD with scipy's sparse solver. New
+	votations are folded in with an incremental SVD update (Brand, 2006),
+	which only touches the new columns; deputies seen for the first time are
+	added as new rows. A few extra components are kept internally so the
+	incremental updates stay close to a full recomputation.
+	"""
+
+	def __init__(self, dimensions=2, oversampling=8):
+		"""
+		Args:
+			dimensions (int): Number of dimensions returned by `embeddings`.
+			oversampling (int): Extra components kept to stabilize updates.
+		"""
+		self.dimensions = dimensions
+		self.rank = dimensions + oversampling
+
+		self.deputies = pd.Index([], name='deputy', dtype=object)
+		self.vote_ids = pd.Index([], name='vote_id', dtype=object)
+		self.deputy_blocks = pd.Series(dtype=object, name='block')
+		self.vote_counts = pd.Series(dtype='int64', name='votes')
+		self.U = np.zeros((0, 0))
+		self.S = np.zeros(0)
+
+	@property
+	def seen_ids(self):
+		"""Set of votation IDs already incorporated into the model."""
+		return set(self.vote_ids)
+
+	def fit(self, votes_df):
+		"""
+		Computes the embeddings from scratch.
+
+		Args:
+			votes_df (pd.DataFrame): Votes with columns vote_id, deputy, block and vote.
+
+		Returns:
+			IdealPointModel: The fitted model.
+		"""
+		self.__init__(self.dimensions, self.rank - self.dimensions)
+		return self.partial_fit(votes_df)
+
+	def partial_fit(self, votes_df):
+		"""
+		Folds in the votations not yet seen by the model. Votations already
+		included are ignored, so the full history can be passed safely.
+
+		Args:
+			votes_df (pd.DataFrame): Votes with columns vote_id, deputy, block and vote.
+				Rows should be in date order so the latest block of each deputy wins.
+
+		Returns:
+			IdealPointModel: The updated model.
+		"""
+		votes_df = votes_df[~votes_df['vote_id'].isin(self.seen_ids)]
+		if votes_df.empty:
+			return self
+
+		self._update_deputies(votes_df)
+		matrix, vote_ids = build_vote_matrix(votes_df, self.deputies)
+
+		# Deputies seen for the first time start with zero coordinates
+		self.U = np.vstack([self.U, np.zeros((len(self.deputies) - self.U.shape[0], self.U.shape[1]))])
+
+		if self.S.size == 0:
+			self.U, self.S = self._truncated_svd(matrix)
+		else:
+			for start in range(0, matrix.shape[1], UPDATE_BATCH_SIZE):
+				self._fold_in(matrix[:, start:start + UPDATE_BATCH_SIZE].toarray())
+
+		self.vote_ids = self.vote_ids.append(vote_ids)
+
+		return self
+
+	def _update_deputies(self, votes_df):
+		"""Registers new deputies, their latest block and their observed vote counts."""
+		deputies = votes_df['deputy'].astype(object)
+		new_deputies = pd.Index(deputies.unique()).difference(self.deputies)
+		self.deputies = self.deputies.append(pd.Index(new_deputies, name='deputy'))
+
+		latest_block = votes_df['block'].astype(object).groupby(deputies).last()
+		self.deputy_blocks = latest_block.combine_first(self.deputy_blocks).rename('block')
+
+		observed = votes_df['vote'].isin(list(VOTE_VALUES))
+		counts = observed.groupby(deputies).sum()
+		self.vote_counts = self.vote_counts.add(counts, fill_value=0).astype('int64')
+
+	def _truncated_svd(self, matrix):
+		"""Returns the left singular vectors and values of the largest components."""
+		rank = min(self.rank, min(matrix.shape) - 1)
+		if rank < 1:
+			U, S, _ = np.linalg.svd(matrix.toarray(), full_matrices=False)
+		else:
+			U, S, _ = svds(matrix, k=rank, random_state=0)
+
+		order = np.argsort(S)[::-1]
+		return U[:, order], S[order]
+
+	def _fold_in(self, columns):
+		"""Incremental SVD update with new (dense) columns."""
+		k = self.S.size
+		projection = self.U.T @ columns
+		residual = columns - self.U @ projection
+		Q, R = np.linalg.qr(residual)
+
+		middle = np.block([
+			[np.diag(self.S), projection],
+			[np.zeros((R.shape[0], k)), R],
+		])
+		U_middle, S_middle, _ = np.linalg.svd(middle, full_matrices=False)
+
+		rank = min(self.rank, S_middle.size)
+		self.U = np.hstack([self.U, Q]) @ U_middle[:, :rank]
+		self.S = S_middle[:rank]
+
+	def embeddings(self, min_votes=1):
+		"""
+		Returns the coordinates of each deputy. The sign of every dimension
+		is oriented so that the officialism block has positive mean.
+
+		Args:
+			min_votes (int): Minimum number of AFIRMATIVO/NEGATIVO/ABSTENCION votes.
+
+		Returns:
+			pd.DataFrame: Columns deputy, block, votes and dim_1 ... dim_N.
+		"""
+		dimensions = min(self.dimensions, self.S.size)
+		coordinates = self.U[:, :dimensions] * self.S[:dimensions]
+
+		embeddings_df = pd.DataFrame(
+			coordinates,
+			index=self.deputies,
+			columns=[f"dim_{i + 1}" for i in range(dimensions)]
+		)
+		embeddings_df.insert(0, 'block', self.deputy_blocks.reindex(self.deputies))
+		embeddings_df.insert(1, 'votes', self.vote_counts.reindex(self.deputies).fillna(0).astype('int64'))
+
+		officialism = embeddings_df['block'] == OFFICIALISM_BLOCK
+		if officialism.any():
+			for column in embeddings_df.columns[2:]:
+				if embeddings_df.loc[officialism, column].mean() < 0:
+					embeddings_df[column] = -embeddings_df[column]
+
+		embeddings_df = embeddings_df[embeddings_df['votes'] >= min_votes]
+
+		return embeddings_df.reset_index()
+
+	def save(self, path):
+		"""Stores the model state in a compressed .npz file."""
+		np.savez_compressed(
+			path,
+			U=self.U,
+			S=self.S,
+			dimensions=self.dimensions,
+			rank=self.rank,
+			deputies=self.deputies.to_numpy(dtype=str),
+			vote_ids=self.vote_ids.to_numpy(dtype=str),
+			blocks=self.deputy_blocks.reindex(self.deputies).fillna('').to_numpy(dtype=str),
+			vote_counts=self.vote_counts.reindex(self.deputies).fillna(0).to_numpy(dtype='int64'),
+		)
+
+	@classmethod
+	def load(cls, path):
+		"""Restores a model stored with `save`."""
+		with np.load(path) as data:
+			model = cls(int(data['dimensions']), int(data['rank']) - int(data['dimensions']))
+			model.U = data['U']
+			model.S = data['S']
+			model.deputies = pd.Index(data['deputies'].astype(object), name='deputy')
+			model.vote_ids = pd.Index(data['vote_ids'].astype(object), name='vote_id')
+			model.deputy_blocks = pd.Series(data['blocks'].astype(object), index=model.deputies, name='block')
+			model.vote_counts = pd.Series(data['vote_counts'], index=model.deputies, name='votes')
+
+		return model
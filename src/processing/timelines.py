@@ -0,0 +1,125 @@
+import pandas as pd
+import numpy as np
+
+# Per-vote indicators stored for every deputy, in column order
+TIMELINE_SERIES = ['loyalty', 'officialism', 'attendance']
+
+
+class DeputyTimelines:
+	"""
+	Date-ordered per-deputy series of loyalty, officialism alignment and
+	attendance, precomputed once for the whole history.
+
+	Every deputy's votes are a contiguous slice of flat arrays (CSR layout:
+	`offsets[i]:offsets[i + 1]` for the i-th deputy), and the indicators are
+	stored as running sums, so the rolling mean over any window is the
+	difference of two rows. A profile therefore costs one slice, whatever
+	the number of votes of the deputy.
+
+	The indicators follow analyze_votations: loyalty and officialism count
+	an absence as not aligned, so the mean of a whole series equals the
+	deputy's average_loyalty and officialism_support.
+	"""
+
+	def __init__(self):
+		self.deputies = pd.Index([], name='deputy')
+		self.offsets = np.zeros(1, dtype='int64')
+		self.dates = np.array([], dtype='datetime64[D]')
+		self.cumulative = np.zeros((1, len(TIMELINE_SERIES)), dtype='int32')
+		self.vote_ids = pd.Index([], name='vote_id')
+
+	@property
+	def seen_ids(self):
+		"""IDs of the votations included in the timelines."""
+		return set(self.vote_ids)
+
+	def fit(self, votation_results, dates):
+		"""
+		Builds the timelines from per-vote results.
+
+		Args:
+			votation_results (pd.DataFrame): Output of get_votation_results.
+			dates (pd.Series): Votation date indexed by votation ID.
+
+		Returns:
+			DeputyTimelines: The fitted timelines.
+		"""
+		df = pd.DataFrame({
+			'deputy': votation_results['deputy'].astype(object),
+			'date': pd.to_datetime(votation_results['vote_id'].map(dates)).to_numpy(dtype='datetime64[D]'),
+			'vote_id': votation_results['vote_id'].astype(object),
+			'loyalty': votation_results['loyalty'],
+			'officialism': votation_results['supported_officialism'],
+			'attendance': ~votation_results['absent'],
+		}).sort_values(['deputy', 'date', 'vote_id'], kind='stable')
+
+		self.deputies = pd.Index(df['deputy'].unique(), name='deputy')
+		counts = df.groupby('deputy', sort=False).size().reindex(self.deputies).to_numpy()
+		self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype('int64')
+		self.dates = df['date'].to_numpy(dtype='datetime64[D]')
+
+		values = df[TIMELINE_SERIES].to_numpy(dtype='int32')
+		self.cumulative = np.vstack([np.zeros((1, len(TIMELINE_SERIES)), dtype='int32'), np.cumsum(values, axis=0, dtype='int32')])
+		self.vote_ids = pd.Index(sorted(df['vote_id'].unique()), name='vote_id')
+
+		return self
+
+	def series(self, deputy, window=20, max_points=300):
+		"""
+		Returns the rolling means of a deputy's indicators, downsampled.
+
+		Args:
+			deputy (str): Deputy name.
+			window (int): Votes per rolling window (expanding over the first ones).
+			max_points (int): Maximum number of points returned. The window is
+				widened to at least votes / max_points so that the sampled
+				points summarize every vote.
+
+		Returns:
+			pd.DataFrame: Rolling means of TIMELINE_SERIES indexed by date
+				(empty if the deputy has no votes).
+		"""
+		if deputy not in self.deputies:
+			return pd.DataFrame(columns=TIMELINE_SERIES, index=pd.DatetimeIndex([], name='date'), dtype='float64')
+
+		i = self.deputies.get_loc(deputy)
+		start, end = self.offsets[i], self.offsets[i + 1]
+		votes = end - start
+		window = max(window, int(np.ceil(votes / max_points)))
+
+		# Positions (1-based) of the sampled votes and the start of their windows
+		points = np.unique(np.linspace(1, votes, min(votes, max_points)).round().astype('int64'))
+		window_starts = np.maximum(points - window, 0)
+
+		sums = self.cumulative[start + points] - self.cumulative[start + window_starts]
+		means = sums / (points - window_starts)[:, None]
+
+		return pd.DataFrame(
+			means,
+			columns=TIMELINE_SERIES,
+			index=pd.DatetimeIndex(self.dates[start + points - 1], name='date')
+		)
+
+	def save(self, path):
+		"""Stores the timelines in a compressed .npz file."""
+		np.savez_compressed(
+			path,
+			deputies=self.deputies.to_numpy(dtype=str),
+			offsets=self.offsets,
+			dates=self.dates,
+			cumulative=self.cumulative,
+			vote_ids=self.vote_ids.to_numpy(dtype=str),
+		)
+
+	@classmethod
+	def load(cls, path):
+		"""Restores timelines stored with `save`."""
+		timelines = cls()
+		with np.load(path) as data:
+			timelines.deputies = pd.Index(data['deputies'].astype(object), name='deputy')
+			timelines.offsets = data['offsets']
+			timelines.dates = data['dates']
+			timelines.cumulative = data['cumulative']
+			timelines.vote_ids = pd.Index(data['vote_ids'].astype(object), name='vote_id')
+
+		return timelines
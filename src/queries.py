@@ -0,0 +1,676 @@
+"""
+Read-only Query and Analysis API
+
+This module exposes the functions used by the Streamlit views to read
+votation data from the database and compute deputy statistics. It only
+depends on pandas, SQLAlchemy and the analysis helpers, so importing it
+never loads the scraping stack (requests, BeautifulSoup).
+"""
+
+import threading
+
+import pandas as pd
+from sqlalchemy import text, bindparam
+
+from src.processing.analyzer import determine_loyalty_votation, get_officialism_block, VOTE_CATEGORIES, OFFICIALISM_PERIODS
+from src.processing.timelines import DeputyTimelines
+from src.database.connections import SessionLocal
+from src.database.search import search_votations
+from src.database.models import VotationMetadata, DeputiesVoting
+
+
+# Column name to (model column, leading categories) of the shared categorical dtypes
+CATEGORY_COLUMNS = {
+	'deputy': (DeputiesVoting.deputy, []),
+	'block': (DeputiesVoting.block, []),
+	'province': (DeputiesVoting.province, []),
+	'vote': (DeputiesVoting.vote, VOTE_CATEGORIES),
+	'type': (VotationMetadata.type, []),
+	'result': (VotationMetadata.result, []),
+}
+
+# Shared dtypes by database URL, read once per process (see get_category_dtypes)
+_category_dtypes = {}
+_category_lock = threading.Lock()
+
+
+def _category_dtype(leading, values):
+	"""Categorical dtype with the leading categories first, then the other values sorted."""
+	return pd.CategoricalDtype(list(leading) + sorted(set(values) - set(leading)))
+
+
+def get_category_dtypes(db):
+	"""
+	Build the categorical dtypes shared by every frame returned by this module.
+	Categories are the sorted distinct values stored in the database, so frames
+	from different calls can be concatenated or merged without losing the
+	categorical dtype.
+
+	The distinct values are read once per process and database; values
+	stored afterwards are added by apply_category_dtypes when a frame
+	contains them, and clear_category_dtypes drops the cache after an ingest.
+	
+	Args:
+		db (Session): Database session
+		
+	Returns:
+		dict: Column name to pd.CategoricalDtype for deputy, block, province,
+			  vote, type and result
+	"""
+	key = str(db.bind.url)
+	with _category_lock:
+		if key not in _category_dtypes:
+			_category_dtypes[key] = {
+				name: _category_dtype(leading, [value for (value,) in db.query(column).distinct() if value is not None])
+				for name, (column, leading) in CATEGORY_COLUMNS.items()
+			}
+		return _category_dtypes[key]
+
+
+def clear_category_dtypes():
+	"""Forget the cached categories, so the next call reads them again."""
+	with _category_lock:
+		_category_dtypes.clear()
+
+
+def apply_category_dtypes(df, dtypes):
+	"""
+	Convert the columns of df that have a shared categorical dtype. Values
+	missing from the categories (stored after they were read) extend the
+	shared dtype in place, so they never become NaN.
+	
+	Args:
+		df (pd.DataFrame): Frame read from the database
+		dtypes (dict): Output of get_category_dtypes
+		
+	Returns:
+		pd.DataFrame: The same frame with categorical columns
+	"""
+	columns = [column for column in dtypes if column in df.columns]
+	with _category_lock:
+		for column in columns:
+			unseen = set(df[column].dropna().unique()) - set(dtypes[column].categories)
+			if unseen:
+				leading = CATEGORY_COLUMNS[column][1]
+				dtypes[column] = _category_dtype(leading, list(dtypes[column].categories) + list(unseen))
+		return df.astype({column: dtypes[column] for column in columns})
+
+
+def officialism_sql(periods=None):
+	"""
+	Build a SQL expression giving the officialism block of each votation
+	according to its date.
+	
+	Args:
+		periods (list, optional): (start, end, block) tuples, defaults to
+			OFFICIALISM_PERIODS
+		
+	Returns:
+		tuple: (SQL CASE expression over vm.date, bind parameters)
+	"""
+	periods = OFFICIALISM_PERIODS if periods is None else periods
+	if not periods:
+		return "NULL", {}
+
+	cases = []
+	params = {}
+	for i, (start, end, block) in enumerate(periods):
+		condition = f"vm.date >= :officialism_start_{i}"
+		params[f'officialism_start_{i}'] = start.isoformat()
+		if end is not None:
+			condition += f" AND vm.date <= :officialism_end_{i}"
+			params[f'officialism_end_{i}'] = end.isoformat()
+		cases.append(f"WHEN {condition} THEN :officialism_block_{i}")
+		params[f'officialism_block_{i}'] = block
+
+	return f"CASE {' '.join(cases)} END", params
+
+
+# Per-vote flags equivalent to determine_loyalty_votation, computed inside
+# SQLite: window functions give each vote its block's, the votation's and the
+# officialism's AFIRMATIVO/NEGATIVO counts. {officialism} is replaced by the
+# expression returned by officialism_sql and {votation_filter} by the chamber
+# and votation conditions of votation_filter_sql (every window is partitioned
+# by votation, so restricting the votations doesn't change their flags).
+VOTATION_FLAGS_CTE = """
+WITH votes AS (
+	SELECT dv.vote_id, dv.deputy, dv.block, dv.vote, {officialism} AS officialism
+	FROM deputies_votes AS dv
+	JOIN votation_metadata AS vm ON vm.id = dv.vote_id
+	WHERE dv.vote IS NOT 'PRESIDENTE'{votation_filter}
+),
+counts AS (
+	SELECT
+		vote_id,
+		block,
+		deputy,
+		vote,
+		SUM(CASE WHEN vote = 'AFIRMATIVO' THEN 1 ELSE 0 END) OVER by_block AS block_affirmatives,
+		SUM(CASE WHEN vote = 'NEGATIVO' THEN 1 ELSE 0 END) OVER by_block AS block_negatives,
+		SUM(CASE WHEN vote = 'AFIRMATIVO' THEN 1 ELSE 0 END) OVER by_votation AS affirmatives,
+		SUM(CASE WHEN vote = 'NEGATIVO' THEN 1 ELSE 0 END) OVER by_votation AS negatives,
+		SUM(CASE WHEN block = officialism THEN 1 ELSE 0 END) OVER by_votation AS officialism_seats,
+		SUM(CASE WHEN block = officialism AND vote = 'AFIRMATIVO' THEN 1 ELSE 0 END) OVER by_votation AS officialism_affirmatives,
+		SUM(CASE WHEN block = officialism AND vote = 'NEGATIVO' THEN 1 ELSE 0 END) OVER by_votation AS officialism_negatives
+	FROM votes
+	WINDOW
+		by_block AS (PARTITION BY vote_id, block),
+		by_votation AS (PARTITION BY vote_id)
+),
+flags AS (
+	SELECT
+		vote_id,
+		block,
+		deputy,
+		vote,
+		CASE
+			WHEN block_affirmatives > block_negatives AND vote = 'AFIRMATIVO' THEN 1
+			WHEN block_affirmatives <= block_negatives AND vote = 'NEGATIVO' THEN 1
+			ELSE 0
+		END AS loyalty,
+		CASE
+			WHEN officialism_seats = 0 THEN 0
+			WHEN officialism_affirmatives > officialism_negatives AND vote = 'AFIRMATIVO' THEN 1
+			WHEN officialism_affirmatives <= officialism_negatives AND vote = 'NEGATIVO' THEN 1
+			ELSE 0
+		END AS supported_officialism,
+		CASE
+			WHEN affirmatives > negatives AND vote = 'AFIRMATIVO' THEN 1
+			WHEN affirmatives <= negatives AND vote = 'NEGATIVO' THEN 1
+			ELSE 0
+		END AS accerted
+	FROM counts
+)
+"""
+
+# Per-vote results, reused by the topic-scoped analysis
+VOTATION_RESULTS_SQL = VOTATION_FLAGS_CTE + """
+SELECT
+	vote_id,
+	block,
+	deputy,
+	vote,
+	loyalty,
+	supported_officialism,
+	accerted,
+	COALESCE(vote = 'AUSENTE', 0) AS absent,
+	COALESCE(vote = 'SIN VOTAR', 0) AS not_voted,
+	COALESCE(vote = 'ABSTENCION', 0) AS abstention
+FROM flags
+WHERE block IS NOT NULL AND deputy IS NOT NULL
+"""
+
+# Same statistics as the pandas path of analyze_votations; only the final
+# per-deputy aggregates are returned to Python.
+DEPUTY_STATISTICS_SQL = VOTATION_FLAGS_CTE + """
+SELECT
+	block,
+	deputy,
+	AVG(loyalty) AS average_loyalty,
+	SUM(CASE WHEN vote IN ('AFIRMATIVO', 'NEGATIVO') THEN 1 ELSE 0 END) AS total_votes,
+	COUNT(vote) AS total_participation,
+	AVG(supported_officialism) AS officialism_support,
+	SUM(accerted) AS accerted,
+	SUM(CASE WHEN vote = 'AUSENTE' THEN 1 ELSE 0 END) AS absent,
+	SUM(CASE WHEN vote = 'SIN VOTAR' THEN 1 ELSE 0 END) AS not_voted,
+	SUM(CASE WHEN vote = 'ABSTENCION' THEN 1 ELSE 0 END) AS abstention
+FROM flags
+WHERE block IS NOT NULL AND deputy IS NOT NULL
+GROUP BY block, deputy
+ORDER BY block, deputy
+"""
+
+FLAG_COLUMNS = ['loyalty', 'supported_officialism', 'accerted', 'absent', 'not_voted', 'abstention']
+
+COUNT_COLUMNS = ['total_votes', 'total_participation', 'accerted', 'absent', 'not_voted', 'abstention']
+
+RATE_COLUMNS = ['average_loyalty', 'officialism_support']
+
+# Mergeable per-(block, deputy) accumulators: every statistic of
+# analyze_votations is one of them or a ratio of two, so partial results
+# over disjoint sets of votations are combined by adding them.
+ACCUMULATOR_COLUMNS = [
+	'rows', 'participation', 'votes', 'loyalty', 'supported_officialism',
+	'accerted', 'absent', 'not_voted', 'abstention'
+]
+
+# Chamber analyzed by default: deputies and senators never share blocks,
+# rankings or models, so the analyses read a single chamber at a time
+DEFAULT_CHAMBER = 'diputados'
+
+
+def filter_chamber(query, chamber):
+	"""
+	Restrict an ORM query over VotationMetadata to a chamber.
+	
+	Args:
+		query (Query): Query selecting from or joined with VotationMetadata
+		chamber (str): Chamber name, or None for every chamber
+		
+	Returns:
+		Query: The filtered query
+	"""
+	return query if chamber is None else query.filter(VotationMetadata.chamber == chamber)
+
+
+def votation_filter_sql(chamber, votation_ids=None):
+	"""
+	Build the {votation_filter} condition of VOTATION_FLAGS_CTE.
+	
+	Args:
+		chamber (str): Chamber name, or None for every chamber
+		votation_ids (Iterable[str], optional): Only these votations
+		
+	Returns:
+		tuple: (SQL condition starting with AND, or empty, bind parameters)
+	"""
+	condition, params = '', {}
+	if chamber is not None:
+		condition += ' AND vm.chamber = :chamber'
+		params['chamber'] = chamber
+	if votation_ids is not None:
+		condition += ' AND dv.vote_id IN :votation_ids'
+		params['votation_ids'] = list(votation_ids)
+	return condition, params
+
+
+def analyze_votations(backend='pandas', chunk_size=500, chamber=DEFAULT_CHAMBER):
+	"""
+	Analyze all votations of a chamber and return comprehensive statistics.
+	
+	Args:
+		backend (str): 'pandas' loads every votation and aggregates in
+			pandas; 'sql' computes the same statistics inside SQLite and
+			only transfers the final result; 'chunked' streams the votations
+			in chunks and only keeps per-deputy accumulators, so memory is
+			bounded by the chunk size and the number of deputies
+		chunk_size (int): Votations per chunk of the 'chunked' backend
+		chamber (str): Chamber analyzed (every chamber if None)
+	
+	Returns:
+		pd.DataFrame: Grouped analysis with deputy loyalty statistics,
+					 indexed by block and deputy name (categorical), with
+					 int32 counts and the columns:
+					 - average_loyalty: Mean loyalty to party block
+					 - total_votes: Number of votes cast by deputy
+					 - officialism_support: Support rate for government positions
+					 - accerted: Number of votes matching the final outcome
+	"""
+	if backend not in ('pandas', 'sql', 'chunked'):
+		raise ValueError(f"Unknown analysis backend: {backend!r}")
+
+	db = SessionLocal()
+	dtypes = get_category_dtypes(db)
+
+	if backend == 'chunked':
+		accumulators = None
+		for votation_ids in iter_votation_chunks(db, chunk_size, chamber):
+			chunk = accumulate_votation_results(read_votation_results(db, votation_ids, chamber, dtypes))
+			accumulators = chunk if accumulators is None else accumulators.add(chunk, fill_value=0).astype('int64')
+		db.close()
+
+		return statistics_frame(accumulators if accumulators is not None else empty_accumulators(), dtypes)
+
+	if backend == 'sql':
+		officialism, params = officialism_sql()
+		votation_filter, filter_params = votation_filter_sql(chamber)
+		final_analysis_df = pd.read_sql(
+			text(DEPUTY_STATISTICS_SQL.format(officialism=officialism, votation_filter=votation_filter)),
+			db.bind, params={**params, **filter_params}
+		)
+		db.close()
+
+		final_analysis_df = apply_category_dtypes(final_analysis_df, dtypes).set_index(['block', 'deputy'])
+		final_analysis_df[COUNT_COLUMNS] = final_analysis_df[COUNT_COLUMNS].astype('int32')
+		# An empty result comes back without numeric types
+		final_analysis_df[RATE_COLUMNS] = final_analysis_df[RATE_COLUMNS].astype('float64')
+
+		return final_analysis_df
+
+	# Get all votation IDs and dates from database
+	query = filter_chamber(db.query(VotationMetadata.id, VotationMetadata.date), chamber).all()
+
+	votations_result = []
+
+	for row in query:
+		# Query votation data for current ID (IDs are strings, e.g. 'senado:<id>')
+		query = db.query(DeputiesVoting).filter(DeputiesVoting.vote_id == row.id)
+		votation_df = pd.read_sql(query.statement, db.bind, index_col='id')
+		votation_df = apply_category_dtypes(votation_df, dtypes)
+		
+		# Exclude the president from analysis (not a regular deputy)
+		votation_df = votation_df[votation_df['vote'] != 'PRESIDENTE']
+
+		# Analyze loyalty for this specific votation
+		votation_result = determine_loyalty_votation(votation_df, get_officialism_block(row.date))
+		votations_result.append(votation_result)
+
+	db.close()
+
+	if not votations_result:
+		return statistics_frame(empty_accumulators(), dtypes)
+
+	# Combine all votation results
+	df_merged = pd.concat(votations_result)
+	
+	return aggregate_votation_results(df_merged)
+
+
+def aggregate_votation_results(votation_results):
+	"""
+	Aggregate per-vote results into per-deputy statistics.
+	
+	Args:
+		votation_results (pd.DataFrame): Per-vote rows with block, deputy
+			(as columns or index levels), vote and the bool flags loyalty,
+			supported_officialism, accerted, absent, not_voted and abstention
+		
+	Returns:
+		pd.DataFrame: Same frame as analyze_votations
+	"""
+	# Create a new column for counting only AFIRMATIVO and NEGATIVO votes
+	df_merged = votation_results.assign(vote_count=votation_results['vote'].isin(['AFIRMATIVO', 'NEGATIVO']))
+
+	# Group by block and deputy to get aggregate statistics
+	# (observed=True avoids the block x deputy cartesian product of categories)
+	final_analysis_df = df_merged.groupby(['block', 'deputy'], observed=True).agg(
+		average_loyalty=('loyalty', 'mean'),
+		total_votes=('vote_count', 'sum'),
+		total_participation=('vote', 'count'),
+		officialism_support=('supported_officialism', 'mean'),
+		accerted=('accerted', 'sum'),
+		absent=('absent', 'sum'),
+		not_voted=('not_voted', 'sum'),
+		abstention=('abstention', 'sum')
+	)
+
+	final_analysis_df[COUNT_COLUMNS] = final_analysis_df[COUNT_COLUMNS].astype('int32')
+	
+	return final_analysis_df
+
+def iter_votation_chunks(db, chunk_size=500, chamber=DEFAULT_CHAMBER):
+	"""
+	Yield the votation IDs of a chamber in chunks, ordered by ID.
+	
+	Args:
+		db (Session): Database session
+		chunk_size (int): Votations per chunk
+		chamber (str): Chamber name (every chamber if None)
+		
+	Yields:
+		list: Votation IDs of the chunk
+	"""
+	query = filter_chamber(db.query(VotationMetadata.id), chamber).order_by(VotationMetadata.id)
+	votation_ids = (row.id for row in query)
+
+	chunk = []
+	for votation_id in votation_ids:
+		chunk.append(votation_id)
+		if len(chunk) == chunk_size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+def read_votation_results(db, votation_ids=None, chamber=DEFAULT_CHAMBER, dtypes=None, batch_size=2000):
+	"""
+	Run VOTATION_RESULTS_SQL over a chamber, optionally restricted to some votations.
+	
+	Args:
+		db (Session): Database session
+		votation_ids (Iterable[str], optional): Votations to compute (all if None)
+		chamber (str): Chamber name (every chamber if None)
+		dtypes (dict, optional): Output of get_category_dtypes. When given, the
+			rows are fetched in batches that are converted to these categorical
+			dtypes and int8 flags as they arrive, so the whole result never
+			exists as plain str rows
+		batch_size (int): Rows per fetched batch when dtypes are given
+		
+	Returns:
+		pd.DataFrame: Per-vote rows with plain str columns and int flags, or
+			categorical columns and int8 flags if dtypes are given
+	"""
+	officialism, params = officialism_sql()
+	votation_filter, filter_params = votation_filter_sql(chamber, votation_ids)
+
+	query = text(VOTATION_RESULTS_SQL.format(officialism=officialism, votation_filter=votation_filter))
+	if votation_ids is not None:
+		query = query.bindparams(bindparam('votation_ids', expanding=True))
+
+	if dtypes is None:
+		return pd.read_sql(query, db.bind, params={**params, **filter_params})
+
+	flags = {column: 'int8' for column in FLAG_COLUMNS}
+	batches = [
+		apply_category_dtypes(batch, dtypes).astype(flags)
+		for batch in pd.read_sql(query, db.bind, params={**params, **filter_params}, chunksize=batch_size)
+	]
+	if not batches:
+		return apply_category_dtypes(pd.read_sql(query, db.bind, params={**params, **filter_params}), dtypes).astype(flags)
+
+	# Categories may have been extended by a later batch: align the earlier ones
+	return apply_category_dtypes(pd.concat(batches, ignore_index=True), dtypes)
+
+
+def accumulate_votation_results(votation_results):
+	"""
+	Reduce per-vote results to the mergeable accumulators (ACCUMULATOR_COLUMNS).
+	
+	Args:
+		votation_results (pd.DataFrame): Per-vote rows as returned by
+			get_votation_results or read_votation_results
+		
+	Returns:
+		pd.DataFrame: int64 accumulators indexed by block and deputy (as str)
+	"""
+	df = votation_results.assign(
+		rows=1,
+		participation=votation_results['vote'].notna(),
+		votes=votation_results['vote'].isin(['AFIRMATIVO', 'NEGATIVO']),
+	)
+
+	# Group on the (possibly categorical) columns, then index by plain strings
+	# so accumulators from frames with different categories can be added
+	accumulators = df.groupby(['block', 'deputy'], observed=True)[ACCUMULATOR_COLUMNS].sum().astype('int64')
+	accumulators.index = pd.MultiIndex.from_arrays(
+		[accumulators.index.get_level_values(level).astype(object) for level in ('block', 'deputy')],
+		names=['block', 'deputy']
+	)
+
+	return accumulators
+
+
+def empty_accumulators():
+	"""Accumulators of no votation, indexed by block and deputy."""
+	return pd.DataFrame(columns=ACCUMULATOR_COLUMNS, dtype='int64',
+						index=pd.MultiIndex.from_tuples([], names=['block', 'deputy']))
+
+
+def statistics_frame(accumulators, dtypes):
+	"""
+	Build the analyze_votations frame from accumulators.
+	
+	Args:
+		accumulators (pd.DataFrame): Output of accumulate_votation_results,
+			or the sum of several of them
+		dtypes (dict): Output of get_category_dtypes
+		
+	Returns:
+		pd.DataFrame: Same frame as analyze_votations
+	"""
+	final_analysis_df = accumulators_to_statistics(accumulators).reset_index()
+	final_analysis_df = apply_category_dtypes(final_analysis_df, dtypes).set_index(['block', 'deputy']).sort_index()
+	final_analysis_df[COUNT_COLUMNS] = final_analysis_df[COUNT_COLUMNS].astype('int32')
+
+	return final_analysis_df
+
+
+def accumulators_to_statistics(accumulators):
+	"""
+	Derive the analyze_votations statistics from accumulators.
+	
+	Args:
+		accumulators (pd.DataFrame): Output of accumulate_votation_results,
+			or the sum of several of them
+		
+	Returns:
+		pd.DataFrame: The columns of analyze_votations, indexed like accumulators
+	"""
+	return pd.DataFrame({
+		'average_loyalty': accumulators['loyalty'] / accumulators['rows'],
+		'total_votes': accumulators['votes'],
+		'total_participation': accumulators['participation'],
+		'officialism_support': accumulators['supported_officialism'] / accumulators['rows'],
+		'accerted': accumulators['accerted'],
+		'absent': accumulators['absent'],
+		'not_voted': accumulators['not_voted'],
+		'abstention': accumulators['abstention'],
+	}, index=accumulators.index)
+
+
+def get_votation_results(votation_ids=None, chamber=DEFAULT_CHAMBER):
+	"""
+	Compute the per-vote loyalty, officialism and attendance flags of every
+	votation, so scoped analyses can aggregate subsets without recomputing them.
+	
+	Args:
+		votation_ids (Iterable[str], optional): Only compute the flags of these
+			votations (all of them if None)
+		chamber (str): Chamber name (every chamber if None)
+	
+	Returns:
+		pd.DataFrame: One row per vote with columns vote_id, block, deputy,
+					 vote (categorical) and the bool flags loyalty,
+					 supported_officialism, accerted, absent, not_voted
+					 and abstention
+	"""
+	db = SessionLocal()
+	df = apply_category_dtypes(read_votation_results(db, votation_ids, chamber), get_category_dtypes(db))
+	db.close()
+
+	df[FLAG_COLUMNS] = df[FLAG_COLUMNS].astype(bool)
+	return df
+
+
+def build_deputy_timelines(votation_results=None, chamber=DEFAULT_CHAMBER):
+	"""
+	Compute the per-deputy time series shown in the profile trend charts.
+	
+	Args:
+		votation_results (pd.DataFrame, optional): Output of get_votation_results
+			for the same chamber (computed if not given)
+		chamber (str): Chamber name (every chamber if None)
+		
+	Returns:
+		DeputyTimelines: Timelines of every deputy over the whole history
+	"""
+	if votation_results is None:
+		votation_results = get_votation_results(chamber=chamber)
+
+	return DeputyTimelines().fit(votation_results, get_votations_metadata(chamber)['date'])
+
+
+def analyze_topic(query, votation_results=None, chamber=DEFAULT_CHAMBER):
+	"""
+	Compute deputy statistics restricted to the votations of a chamber whose
+	title matches a full-text query.
+	
+	Args:
+		query (str): Words to search for in the votation titles
+		votation_results (pd.DataFrame, optional): Output of
+			get_votation_results for the same chamber, computed if not given
+		chamber (str): Chamber name (every chamber if None)
+		
+	Returns:
+		tuple: (pd.DataFrame with the same columns as analyze_votations,
+				number of matching votations)
+	"""
+	db = SessionLocal()
+	votation_ids = search_votations(db, query)
+	if chamber is not None and votation_ids:
+		chamber_ids = {row.id for row in filter_chamber(db.query(VotationMetadata.id), chamber)}
+		votation_ids = [votation_id for votation_id in votation_ids if votation_id in chamber_ids]
+	db.close()
+
+	if votation_results is None:
+		votation_results = get_votation_results(chamber=chamber)
+
+	topic_results = votation_results[votation_results['vote_id'].isin(votation_ids)]
+
+	return aggregate_votation_results(topic_results), len(votation_ids)
+
+
+def get_votations_metadata(chamber=DEFAULT_CHAMBER):
+	"""
+	Retrieve the metadata of every votation of a chamber from the database.
+	
+	Args:
+		chamber (str): Chamber name (every chamber if None)
+	
+	Returns:
+		pd.DataFrame: Votation metadata with columns including ID, date, title, 
+					 type, result, loaded status, and analyzed status
+	"""
+	db = SessionLocal()
+	query = filter_chamber(db.query(VotationMetadata), chamber)
+	df = pd.read_sql(query.statement, db.bind, index_col='id')
+	df = apply_category_dtypes(df, get_category_dtypes(db))
+	db.close()
+	return df
+
+
+def get_votation_data(votation_id):
+	"""
+	Retrieve votation data for a specific votation ID.
+	
+	Args:
+		votation_id (int): The ID of the votation to retrieve
+		
+	Returns:
+		pd.DataFrame: Votation data with columns including vote ID, deputy name,
+					 block name, province, and vote
+	"""
+	db = SessionLocal()
+	query = db.query(DeputiesVoting).filter(DeputiesVoting.vote_id == votation_id)
+	df = pd.read_sql(query.statement, db.bind, index_col='id')
+	df = apply_category_dtypes(df, get_category_dtypes(db))
+	db.close()
+	return df
+
+
+def get_votes_history(exclude_ids=None, chamber=DEFAULT_CHAMBER):
+	"""
+	Retrieve every deputy vote of a chamber joined with the date of its
+	votation, excluding the chamber president.
+	
+	Args:
+		exclude_ids (Iterable[str], optional): Votation IDs to skip, used to
+			fetch only the actas added since a previous load
+		chamber (str): Chamber name (every chamber if None)
+		
+	Returns:
+		pd.DataFrame: Votes with columns vote_id, date, deputy, block,
+					 province and vote, ordered by date
+	"""
+	db = SessionLocal()
+	query = db.query(
+		DeputiesVoting.vote_id,
+		VotationMetadata.date,
+		DeputiesVoting.deputy,
+		DeputiesVoting.block,
+		DeputiesVoting.province,
+		DeputiesVoting.vote
+	).join(
+		VotationMetadata, DeputiesVoting.vote_id == VotationMetadata.id
+	).filter(DeputiesVoting.vote != 'PRESIDENTE')
+	query = filter_chamber(query, chamber)
+
+	if exclude_ids:
+		query = query.filter(DeputiesVoting.vote_id.notin_(list(exclude_ids)))
+
+	query = query.order_by(VotationMetadata.date, DeputiesVoting.vote_id)
+	df = pd.read_sql(query.statement, db.bind)
+	df = apply_category_dtypes(df, get_category_dtypes(db))
+	db.close()
+	return df
@@ -0,0 +1,315 @@
+"""
+Chamber Source Adapters
+
+Each legislative chamber is read through a source adapter that supplies
+the three ingest steps: listing the votations of a year, fetching the
+acta of a votation and parsing it into votes. Adapters never talk to the
+network directly but through a transport, so they can be run offline
+against recorded pages:
+
+	source = get_source('diputados', transport=FixtureTransport('tests/fixtures/diputados'))
+	source.list_votations(2024)   # parses tests/fixtures/diputados/list_2024.html
+
+A FixtureTransport given a `record` transport fetches the missing pages
+through it and saves them, which is how fixtures are recorded.
+
+Most chamber websites publish an HTML table of votations and one table
+per acta, so TableSource is configured declaratively with the URLs,
+table ids and column positions; chambers that differ override the parse
+methods. Votation IDs are stored as `<chamber>:<native id>` except for
+Diputados, whose IDs predate the other chambers.
+"""
+
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from src.database.integrity import normalize_vote
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
+
+
+class HttpTransport:
+	"""Fetches pages from the chamber website."""
+
+	def __init__(self, timeout: int = 30):
+		self.timeout = timeout
+		self._local = threading.local()
+
+	def fetch(self, method: str, url: str, data: Optional[Dict[str, str]] = None, fixture: Optional[str] = None) -> str:
+		"""
+		Returns the body of a page, raising requests.RequestException on errors.
+		Args:
+			method (str): 'GET' or 'POST'.
+			url (str): Page URL.
+			data (Dict[str, str], optional): Form data of a POST request.
+			fixture (str, optional): Name of the page when recorded (unused here).
+		Returns:
+			str: Page HTML.
+		"""
+		# requests sessions aren't thread-safe: one per worker thread
+		if not hasattr(self._local, 'session'):
+			self._local.session = requests.Session()
+			self._local.session.headers['User-Agent'] = USER_AGENT
+
+		response = self._local.session.request(method, url, data=data, timeout=self.timeout)
+		response.raise_for_status()
+		return response.text
+
+
+class FixtureTransport:
+	"""
+	Serves pages recorded as `<directory>/<fixture>.html`. When `record` is a
+	transport, missing pages are fetched through it and saved.
+	"""
+
+	def __init__(self, directory, record: Optional[HttpTransport] = None):
+		self.directory = Path(directory)
+		self.record = record
+
+	def fetch(self, method: str, url: str, data: Optional[Dict[str, str]] = None, fixture: Optional[str] = None) -> str:
+		path = self.directory / f"{fixture}.html"
+		if not path.exists():
+			if self.record is None:
+				raise FileNotFoundError(f"No recorded page {path} for {method} {url}")
+			path.parent.mkdir(parents=True, exist_ok=True)
+			path.write_text(self.record.fetch(method, url, data, fixture), encoding='utf-8')
+
+		return path.read_text(encoding='utf-8')
+
+
+class TableSource:
+	"""
+	Source adapter for chambers that publish votations and actas as HTML
+	tables. Subclasses set the class attributes below and override the
+	methods whose page layout differs.
+	"""
+
+	# Stored in VotationMetadata.chamber and used as votation ID prefix
+	chamber: str = ''
+	name: str = ''
+	# Most concurrent acta downloads against this website
+	max_concurrency: int = 2
+
+	list_method: str = 'GET'
+	list_url: str = ''
+	list_table_id: str = ''
+	# Column positions in the votation list: date, title and result
+	list_columns: Dict[str, int] = {}
+	date_format: str = '%d/%m/%Y'
+
+	acta_url: str = ''
+	acta_table_id: str = ''
+	# Column positions in the acta: deputy, block, province and vote
+	acta_columns: Dict[str, int] = {}
+	# Chamber spellings of the votes that normalize_vote doesn't know
+	vote_aliases: Dict[str, str] = {}
+
+	def __init__(self, transport=None):
+		self.transport = transport or HttpTransport()
+
+	def votation_id(self, native_id: str) -> str:
+		"""Returns the stored ID of a votation from its ID in the chamber website."""
+		return f"{self.chamber}:{native_id}"
+
+	def native_id(self, votation_id: str) -> str:
+		"""Returns the chamber website ID of a stored votation."""
+		return votation_id.split(':', 1)[1] if ':' in votation_id else votation_id
+
+	def list_payload(self, year: int, search: str) -> Optional[Dict[str, str]]:
+		"""Returns the form data of the votation list request."""
+		return None
+
+	def list_votations(self, year: int, search: str = 'ley') -> List[Dict[str, Any]]:
+		"""
+		Lists the votations of a year.
+		Args:
+			year (int): Year of the votations.
+			search (str): Text searched in the titles, when the website supports it.
+		Returns:
+			List[Dict[str, Any]]: Metadata with id, chamber, date, title, type, result, loaded and analyzed.
+		"""
+		html = self.transport.fetch(
+			self.list_method,
+			self.list_url.format(year=year, search=search),
+			self.list_payload(year, search),
+			fixture=f"list_{year}",
+		)
+		return self.parse_votation_list(html)
+
+	def scrape_votation_data(self, votation_id: str) -> List[Dict[str, Any]]:
+		"""
+		Fetches and parses the acta of a stored votation. Raises
+		requests.RequestException when it can't be downloaded and ValueError
+		when the page doesn't contain the votes table.
+		"""
+		native_id = self.native_id(votation_id)
+		html = self.transport.fetch('GET', self.acta_url.format(id=native_id), fixture=f"acta_{native_id}")
+		return self.parse_votation_data(html, votation_id)
+
+	def _cells(self, row) -> List[str]:
+		# Same text extraction as the stored rows, so re-scraped actas upsert onto them
+		return [cell.text.strip() for cell in row.find_all('td')]
+
+	def row_native_id(self, row, cells: List[str]) -> Optional[str]:
+		"""Returns the website ID of a votation list row (its id attribute by default)."""
+		return row.get('id')
+
+	def parse_result(self, text: str) -> str:
+		return 'positive' if 'AFIRMATIV' in text.upper() or 'APROBAD' in text.upper() else 'negative'
+
+	def parse_votation_list(self, html_content: str) -> List[Dict[str, Any]]:
+		"""Parses the votation list page into votation metadata."""
+		soup = BeautifulSoup(html_content, 'html.parser')
+		table = soup.find(id=self.list_table_id)
+		if table is None:
+			raise ValueError(f"{self.name} votation list has no table #{self.list_table_id}")
+
+		votations = []
+		for row in table.find_all('tr'):
+			cells = self._cells(row)
+			native_id = self.row_native_id(row, cells)
+			if not cells or native_id is None:
+				continue
+
+			result = cells[self.list_columns['result']]
+			votations.append({
+				'id': self.votation_id(native_id),
+				'chamber': self.chamber,
+				'date': datetime.strptime(cells[self.list_columns['date']][:10], self.date_format).date(),
+				'title': cells[self.list_columns['title']],
+				'type': result,
+				'result': self.parse_result(result),
+				'loaded': 0,
+				'analyzed': 0,
+			})
+		return votations
+
+	def parse_vote(self, text: str) -> str:
+		"""Maps the chamber spelling of a vote to the stored one (unknown values are kept)."""
+		return normalize_vote(self.vote_aliases.get(text.upper(), text)) or text
+
+	def parse_votation_data(self, html_content: str, votation_id: str) -> List[Dict[str, Any]]:
+		"""Parses an acta into rows with vote_id, deputy, block, province and vote."""
+		soup = BeautifulSoup(html_content, 'html.parser')
+		table = soup.find('table', attrs={'id': self.acta_table_id})
+		if table is None or table.find('tbody') is None:
+			raise ValueError(f"Votation {votation_id} page has no votes table")
+
+		votation_data = []
+		for row in table.find('tbody').find_all('tr'):
+			cells = self._cells(row)
+			if len(cells) <= max(self.acta_columns.values()):
+				continue
+			votation_data.append({
+				'vote_id': votation_id,
+				'deputy': cells[self.acta_columns['deputy']],
+				'block': cells[self.acta_columns['block']],
+				'province': cells[self.acta_columns['province']],
+				'vote': self.parse_vote(cells[self.acta_columns['vote']]),
+			})
+		return votation_data
+
+
+class DiputadosSource(TableSource):
+	"""Honorable Cámara de Diputados de la Nación (votaciones.hcdn.gob.ar)."""
+
+	chamber = 'diputados'
+	name = 'Cámara de Diputados'
+	max_concurrency = 4
+
+	list_method = 'POST'
+	list_url = 'https://votaciones.hcdn.gob.ar/votaciones/search'
+	list_table_id = 'container-actas'
+	list_columns = {'date': 0, 'title': 1, 'result': 2}
+
+	acta_url = 'https://votaciones.hcdn.gob.ar/votacion/{id}'
+	acta_table_id = 'myTable'
+	acta_columns = {'deputy': 1, 'block': 2, 'province': 3, 'vote': 4}
+
+	def votation_id(self, native_id):
+		# Stored without prefix: the IDs were in use before other chambers
+		return native_id
+
+	def list_payload(self, year, search):
+		return {'txtSearch': search, 'anoSearch': f'{year}'}
+
+	def parse_result(self, text):
+		return 'positive' if text == 'AFIRMATIVO' else 'negative'
+
+
+class SenadoSource(TableSource):
+	"""
+	Honorable Senado de la Nación (senado.gob.ar). Not verified yet: the
+	table ids and column positions haven't been checked against recorded
+	pages, so it isn't in SOURCES. Record fixtures with a FixtureTransport,
+	check the parsed votes and then enable it with register_source.
+	"""
+
+	chamber = 'senado'
+	name = 'Senado'
+	max_concurrency = 2
+
+	list_method = 'POST'
+	list_url = 'https://www.senado.gob.ar/votaciones/actas'
+	list_table_id = 'actasTable'
+	list_columns = {'date': 0, 'title': 2, 'result': 4}
+
+	acta_url = 'https://www.senado.gob.ar/votaciones/detalleActa/{id}'
+	acta_table_id = 'TablaVotos'
+	acta_columns = {'deputy': 1, 'block': 2, 'province': 3, 'vote': 4}
+	vote_aliases = {'SI': 'AFIRMATIVO', 'NO': 'NEGATIVO', 'AUSENTE': 'AUSENTE', 'ABSTENCION': 'ABSTENCION'}
+
+	def list_payload(self, year, search):
+		return {'busqueda_actas[anio]': f'{year}'}
+
+	def row_native_id(self, row, cells):
+		# The acta ID only appears in the link to its detail page
+		link = row.find('a', href=re.compile(r'detalleActa/\d+'))
+		return re.search(r'detalleActa/(\d+)', link['href']).group(1) if link else None
+
+
+# Verified adapters by chamber; others are added with register_source
+SOURCES = {source.chamber: source for source in (DiputadosSource,)}
+
+DEFAULT_SOURCES = ['diputados']
+
+
+def register_source(source_class) -> None:
+	"""Makes a TableSource subclass available to the ingest under its chamber name."""
+	SOURCES[source_class.chamber] = source_class
+
+
+def get_source(chamber: str, transport=None) -> TableSource:
+	"""
+	Creates the adapter of a chamber.
+	Args:
+		chamber (str): Chamber name, a key of SOURCES.
+		transport (optional): HttpTransport or FixtureTransport (HTTP by default).
+	Returns:
+		TableSource: The adapter.
+	"""
+	if chamber not in SOURCES:
+		raise ValueError(f"Unknown chamber source: {chamber!r} (available: {', '.join(SOURCES)})")
+	return SOURCES[chamber](transport)
+
+
+def get_sources(chambers: Optional[Iterable[Any]] = None, transport=None) -> List[TableSource]:
+	"""
+	Creates the adapters of several chambers.
+	Args:
+		chambers (Iterable, optional): Chamber names or ready adapters, such as
+			adapters reading fixtures (DEFAULT_SOURCES if None).
+		transport (optional): Transport of the adapters created by name.
+	Returns:
+		List[TableSource]: The adapters.
+	"""
+	return [
+		chamber if isinstance(chamber, TableSource) else get_source(chamber, transport)
+		for chamber in (chambers or DEFAULT_SOURCES)
+	]
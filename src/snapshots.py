@@ -0,0 +1,217 @@
+"""
+Snapshots Module
+
+Versioned snapshots of the per-deputy analysis, taken after every ingest
+run. A snapshot stores the additive per-(block, deputy) accumulators of
+`src.queries` instead of rates, so the snapshot of a run is the previous
+one plus the accumulators of the votations that run added: only the new
+votations are analyzed. When an already counted acta was corrected the
+accumulators are recomputed from scratch.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import func, inspect
+
+from src.database.connections import SessionLocal, Base
+from src.database.models import (
+	VotationMetadata, ScrapeJob, AnalysisSnapshot, SnapshotVotation, SnapshotCount
+)
+from src.queries import (
+	read_votation_results, accumulate_votation_results, accumulators_to_statistics, filter_chamber,
+	ACCUMULATOR_COLUMNS, DEFAULT_CHAMBER
+)
+
+SNAPSHOT_TABLES = [AnalysisSnapshot.__table__, SnapshotVotation.__table__, SnapshotCount.__table__]
+
+
+def snapshot_tables_exist(db):
+	"""
+	Check whether the snapshot tables have been created.
+
+	Args:
+		db (Session): Database session
+
+	Returns:
+		bool: True if every snapshot table exists
+	"""
+	inspector = inspect(db.bind)
+	return all(inspector.has_table(table.name) for table in SNAPSHOT_TABLES)
+
+
+def get_snapshot_counts(db, snapshot_id):
+	"""
+	Load the counters stored by a snapshot.
+
+	Args:
+		db (Session): Database session
+		snapshot_id (int): Snapshot ID
+
+	Returns:
+		pd.DataFrame: Counters indexed by block and deputy
+	"""
+	query = db.query(SnapshotCount).filter(SnapshotCount.snapshot_id == snapshot_id)
+	df = pd.read_sql(query.statement, db.bind)
+
+	return df.set_index(['block', 'deputy'])[ACCUMULATOR_COLUMNS].astype('int64')
+
+
+def get_counted_hashes(db):
+	"""
+	Return the acta hash every counted votation was last counted with.
+
+	Args:
+		db (Session): Database session
+
+	Returns:
+		dict: Content hash (or None) by votation ID
+	"""
+	latest = db.query(
+		SnapshotVotation.votation_id, func.max(SnapshotVotation.snapshot_id).label('snapshot_id')
+	).group_by(SnapshotVotation.votation_id).subquery()
+
+	rows = db.query(SnapshotVotation.votation_id, SnapshotVotation.content_hash).join(
+		latest,
+		(SnapshotVotation.votation_id == latest.c.votation_id) & (SnapshotVotation.snapshot_id == latest.c.snapshot_id)
+	)
+
+	return {row.votation_id: row.content_hash for row in rows}
+
+
+def create_snapshot(db=None):
+	"""
+	Take a snapshot of the analysis if votations were loaded or corrected
+	since the last one. New votations are added to the previous counters;
+	a corrected or deleted acta triggers a full recomputation.
+
+	Args:
+		db (Session, optional): Database session (a new one if None)
+
+	Returns:
+		int: ID of the new snapshot, or None if nothing changed
+	"""
+	own_session = db is None
+	db = db or SessionLocal()
+
+	try:
+		Base.metadata.create_all(bind=db.bind, tables=SNAPSHOT_TABLES)
+
+		# Snapshots follow the analysis shown in the dashboard: a single chamber
+		loaded_query = filter_chamber(
+			db.query(VotationMetadata.id, ScrapeJob.content_hash)
+			.outerjoin(ScrapeJob, ScrapeJob.votation_id == VotationMetadata.id)
+			.filter(VotationMetadata.loaded == True),
+			DEFAULT_CHAMBER
+		)
+		loaded = {row.id: row.content_hash for row in loaded_query}
+		counted = get_counted_hashes(db)
+
+		added = set(loaded) - set(counted)
+		corrected = {votation_id for votation_id in set(loaded) & set(counted) if loaded[votation_id] != counted[votation_id]}
+		removed = set(counted) - set(loaded)
+
+		if not (added or corrected or removed):
+			return None
+
+		previous = db.query(AnalysisSnapshot).order_by(AnalysisSnapshot.id.desc()).first()
+		full_recompute = previous is None or bool(corrected or removed)
+
+		if full_recompute:
+			counts = accumulate_votation_results(read_votation_results(db, loaded))
+		else:
+			counts = get_snapshot_counts(db, previous.id).add(
+				accumulate_votation_results(read_votation_results(db, added)), fill_value=0
+			).astype('int64')
+
+		snapshot = AnalysisSnapshot(
+			created_at=datetime.now(),
+			votations=len(loaded),
+			added=len(added),
+			full_recompute=full_recompute,
+		)
+		db.add(snapshot)
+		db.flush()
+
+		db.bulk_insert_mappings(SnapshotVotation, [
+			{'snapshot_id': snapshot.id, 'votation_id': votation_id, 'content_hash': loaded[votation_id]}
+			for votation_id in added | corrected
+		])
+		db.bulk_insert_mappings(SnapshotCount, [
+			{'snapshot_id': snapshot.id, 'block': block, 'deputy': deputy, **row}
+			for (block, deputy), row in zip(counts.index, counts.to_dict('records'))
+		])
+		db.commit()
+
+		return snapshot.id
+	finally:
+		if own_session:
+			db.close()
+
+
+def diff_snapshots(db, old_id, new_id):
+	"""
+	Compare two snapshots deputy by deputy.
+
+	Args:
+		db (Session): Database session
+		old_id (int): Earlier snapshot ID
+		new_id (int): Later snapshot ID
+
+	Returns:
+		pd.DataFrame: Per deputy (block, deputy) loyalty before and after,
+					 its change, the votes and absences added between both
+					 snapshots and the loyalty ranking before and after
+					 (1 = most loyal; NaN when absent from a snapshot)
+	"""
+	old_counts = get_snapshot_counts(db, old_id)
+	new_counts = get_snapshot_counts(db, new_id)
+	delta = new_counts.sub(old_counts.reindex(new_counts.index, fill_value=0))
+
+	before = accumulators_to_statistics(old_counts)['average_loyalty'].reindex(new_counts.index)
+	after = accumulators_to_statistics(new_counts)['average_loyalty']
+
+	diff_df = pd.DataFrame({
+		'loyalty_before': before,
+		'loyalty_after': after,
+		'loyalty_change': after - before,
+		'new_votes': delta['participation'],
+		'new_absences': delta['absent'],
+		'rank_before': before.rank(ascending=False, method='min'),
+		'rank_after': after.rank(ascending=False, method='min'),
+	})
+	diff_df['rank_change'] = diff_df['rank_before'] - diff_df['rank_after']
+
+	return diff_df.reset_index()
+
+
+def get_last_update_changes():
+	"""
+	Compare the latest snapshot with the previous one.
+
+	Returns:
+		tuple: (diff DataFrame from diff_snapshots, dict with the dates of both
+			   snapshots and the number of votations added), or None if there
+			   are fewer than two snapshots
+	"""
+	db = SessionLocal()
+
+	try:
+		if not snapshot_tables_exist(db):
+			return None
+
+		snapshots = db.query(AnalysisSnapshot).order_by(AnalysisSnapshot.id.desc()).limit(2).all()
+		if len(snapshots) < 2:
+			return None
+
+		latest, previous = snapshots
+		summary = {
+			'updated_at': latest.created_at,
+			'previous_at': previous.created_at,
+			'added': latest.added,
+			'full_recompute': latest.full_recompute,
+		}
+
+		return diff_snapshots(db, previous.id, latest.id), summary
+	finally:
+		db.close()
@@ -1,13 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
 
-from src.data_loader import load_analysis_data
-from main import get_votations_metadata, get_votation_data
+from src.data_loader import load_analysis_data, load_ideal_points, load_coalitions, load_block_alignment, load_last_update_changes
+from src.queries import get_votations_metadata, get_votation_data
 
 def show_home():
 	"""Display home page with navigation buttons and main dashboard."""
+	import plotly.express as px
+
 	# Load data
 	df_votations = load_analysis_data()
 	df_votations_metadata = get_votations_metadata()
@@ -20,7 +21,7 @@ def show_home():
 	# Calculate key metrics for dashboard
 	votations_count = len(df_votations_metadata.index.unique())
 	cohesion_general = df_votations['average_loyalty'].mean()
-	bloque_mas_cohesivo = df_votations.groupby('block')['average_loyalty'].mean().idxmax()
+	bloque_mas_cohesivo = df_votations.groupby('block', observed=True)['average_loyalty'].mean().idxmax()
 	ultima_votacion = pd.to_datetime(df_votations_metadata['date']).max().strftime('%d/%m/%Y')
 
 	# Display key metrics in columns
@@ -38,6 +39,43 @@ def show_home():
 	with col4:
 		st.metric(label="Última Votación Registrada", value=ultima_votacion)
 
+	# Changes introduced by the last ingest run
+	last_update = load_last_update_changes()
+	if last_update is not None:
+		changes_df, update_summary = last_update
+		with st.expander(
+			f"Cambios desde la última actualización ({update_summary['added']} votaciones nuevas, "
+			f"{update_summary['updated_at']:%d/%m/%Y %H:%M})"
+		):
+			changed_df = changes_df[(changes_df['new_votes'] > 0) | (changes_df['loyalty_change'].fillna(0) != 0)]
+			col_loyalty, col_absences, col_ranking = st.columns(3)
+			
+			with col_loyalty:
+				st.subheader("Mayores cambios de lealtad")
+				movers = changed_df.reindex(changed_df['loyalty_change'].abs().sort_values(ascending=False).index).head(5)
+				for mover in movers.itertuples():
+					st.markdown(
+						f"**{mover.deputy}** ({mover.block}): {mover.loyalty_after:.1%} "
+						f"({mover.loyalty_change:+.1%})"
+					)
+			
+			with col_absences:
+				st.subheader("Nuevas ausencias")
+				absentees = changed_df[changed_df['new_absences'] > 0].sort_values('new_absences', ascending=False).head(5)
+				for absentee in absentees.itertuples():
+					st.markdown(f"**{absentee.deputy}** ({absentee.block}): {absentee.new_absences} de {absentee.new_votes}")
+				if absentees.empty:
+					st.caption("Sin ausencias en las nuevas votaciones")
+			
+			with col_ranking:
+				st.subheader("Cambios en el ranking")
+				climbers = changed_df.dropna(subset=['rank_change']).sort_values('rank_change', ascending=False)
+				for climber in pd.concat([climbers.head(3), climbers.tail(2)]).itertuples():
+					st.markdown(
+						f"**{climber.deputy}**: #{climber.rank_before:.0f} → #{climber.rank_after:.0f} "
+						f"({climber.rank_change:+.0f})"
+					)
+
 	st.divider()
 	
 	# Chamber composition pie chart section
@@ -49,10 +87,12 @@ def show_home():
 	latest_votation_id = latest_votation_metadata_df_entry.index[0]
 
 	latest_votation_df = get_votation_data(latest_votation_id)
-	deputies_count = len(latest_votation_df['deputy'].unique())
+	deputies_count = latest_votation_df['deputy'].nunique()
 
 	# Prepare data for pie chart visualization
-	votation_df = latest_votation_df['block'].value_counts().reset_index()
+	# Categorical counts include every known block; keep only those seated
+	block_counts = latest_votation_df['block'].value_counts()
+	votation_df = block_counts[block_counts > 0].reset_index()
 	votation_df.columns = ['Bloque', 'Cantidad']
 	votation_df['Porcentaje'] = (votation_df['Cantidad'] / deputies_count * 100).round(1)
 
@@ -89,6 +129,116 @@ def show_home():
 
 	st.plotly_chart(fig, use_container_width=True)
 	st.divider()
+
+	# Ideological map section
+	st.header("Mapa Ideológico")
+	st.caption(
+		"Posición de cada diputado estimada a partir de todas sus votaciones "
+		"(descomposición en valores singulares de la matriz de votos). "
+		"Diputados cercanos votan de forma similar."
+	)
+
+	ideal_points_df = load_ideal_points(min_votes=len(df_votations_metadata) // 10)
+
+	if {'dim_1', 'dim_2'}.issubset(ideal_points_df.columns):
+		fig = px.scatter(
+			ideal_points_df,
+			x='dim_1',
+			y='dim_2',
+			color='block',
+			hover_name='deputy',
+			hover_data={'votes': True, 'dim_1': ':.2f', 'dim_2': ':.2f'},
+			labels={'dim_1': 'Dimensión 1', 'dim_2': 'Dimensión 2', 'block': 'Bloque', 'votes': 'Votos'},
+		)
+		fig.update_traces(marker={'size': 9, 'opacity': 0.8})
+		fig.update_layout(height=600, legend={'font': {'size': 10}})
+
+		st.plotly_chart(fig, use_container_width=True)
+	else:
+		st.info("No hay suficientes votaciones para estimar el mapa ideológico.")
+
+	st.divider()
+
+	# Detected coalitions section
+	st.header("Coaliciones Detectadas")
+	st.caption(
+		"Grupos de diputados que votan igual en al menos el 80% de las votaciones que comparten, "
+		"detectados sobre la red de co-votación sin usar los bloques oficiales."
+	)
+
+	_, coalitions_summary_df, coalitions_ari = load_coalitions()
+	coalitions_summary_df = coalitions_summary_df[coalitions_summary_df['size'] > 1]
+
+	col1, col2 = st.columns(2)
+	col1.metric("Coaliciones (2+ diputados)", len(coalitions_summary_df))
+	col2.metric("Coincidencia con Bloques Oficiales", f"{coalitions_ari:.2f}", help="Índice de Rand ajustado: 1 = idénticos a los bloques")
+
+	st.dataframe(
+		coalitions_summary_df.rename(columns={
+			'size': 'Diputados',
+			'blocks': 'Bloques',
+			'main_block': 'Bloque Principal',
+			'main_block_share': '% Bloque Principal',
+			'blocks_list': 'Bloques Incluidos',
+		}).style.format({'% Bloque Principal': '{:.0%}'}),
+		use_container_width=True,
+		hide_index=True,
+	)
+
+	st.divider()
+	
+	# Block alignment section
+	st.header("¿Quién vota con quién?")
+	st.caption(
+		"Porcentaje de votaciones en que la mayoría de dos bloques votó en el mismo sentido "
+		"(sobre las votaciones en que ambos se pronunciaron)"
+	)
+	
+	alignment = load_block_alignment()
+	main_blocks = df_votations.groupby('block', observed=True)['deputy'].nunique().sort_values(ascending=False)
+	main_blocks = [block for block in main_blocks.index if block in alignment.blocks]
+	
+	col_block_a, col_block_b, col_rate = st.columns([2, 2, 1])
+	with col_block_a:
+		block_a = st.selectbox("Bloque", main_blocks, index=0, key="alignment_block_a")
+	with col_block_b:
+		block_b = st.selectbox("Con el bloque", main_blocks, index=min(1, len(main_blocks) - 1), key="alignment_block_b")
+	
+	pair_timeline = alignment.pair_timeline(block_a, block_b)
+	with col_rate:
+		total_shared = pair_timeline['shared'].sum()
+		st.metric(
+			"Coincidencia",
+			f"{pair_timeline['agreements'].sum() / total_shared:.1%}" if total_shared else "-",
+			help=f"Sobre {total_shared} votaciones"
+		)
+	
+	pair_timeline = pair_timeline.dropna(subset=['rate'])
+	fig_pair = px.line(
+		x=pair_timeline.index.to_timestamp(),
+		y=pair_timeline['rate'],
+		markers=True,
+		labels={'x': 'Mes', 'y': 'Coincidencia'},
+		title=f"{block_a} vs {block_b}"
+	)
+	fig_pair.update_yaxes(range=[0, 1.05], tickformat='.0%')
+	st.plotly_chart(fig_pair, use_container_width=True)
+	
+	top_blocks = main_blocks[:10]
+	block_matrix = alignment.block_matrix().loc[top_blocks, top_blocks]
+	fig_matrix = px.imshow(
+		block_matrix,
+		color_continuous_scale='RdYlGn',
+		zmin=0,
+		zmax=1,
+		text_auto='.0%',
+		labels={'x': 'Bloque', 'y': 'Bloque', 'color': 'Coincidencia'},
+		title="Coincidencia entre los 10 bloques más grandes"
+	)
+	fig_matrix.update_layout(height=600)
+	st.plotly_chart(fig_matrix, use_container_width=True)
+	
+	st.divider()
 	
 	# Loyalty ranking section
 	st.header("Ranking de Lealtad Partidaria")
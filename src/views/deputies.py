@@ -2,7 +2,7 @@
 
 import streamlit as st
 import pandas as pd
-from src.data_loader import load_analysis_data
+from src.data_loader import load_analysis_data, load_topic_analysis
 from src.views.deputy_profile import show_deputy_profile
 
 ITEMS_PER_PAGE = 20  # Number of deputies to show per page
@@ -13,6 +13,8 @@ def initialize_state():
         st.session_state.block_filter = 'All Blocks'
     if 'search_term' not in st.session_state:
         st.session_state.search_term = ''
+    if 'topic_filter' not in st.session_state:
+        st.session_state.topic_filter = ''
     if 'page_number' not in st.session_state:
         st.session_state.page_number = 1
     if 'selected_deputy' not in st.session_state:
@@ -31,7 +33,7 @@ def show_deputies_list(analysis_df: pd.DataFrame):
 
     # --- RENDER FILTERS ---
     block_list = ['All Blocks'] + sorted(analysis_df['block'].unique().tolist())
-    filter_col1, filter_col2 = st.columns([1, 2])
+    filter_col1, filter_col2, filter_col3 = st.columns([1, 1, 1])
     
     with filter_col1:
         st.selectbox("Filtrar por Bloque:", block_list, key='block_filter', on_change=reset_pagination)
@@ -39,8 +41,16 @@ def show_deputies_list(analysis_df: pd.DataFrame):
     with filter_col2:
         st.text_input("Buscar Diputado:", key='search_term', on_change=reset_pagination)
 
+    with filter_col3:
+        st.text_input("Filtrar por Tema:", key='topic_filter', on_change=reset_pagination,
+                      help="Palabras del título de la ley, por ejemplo: presupuesto, jubilaciones")
+
     # --- APPLY FILTERS ---
     filtered_df = analysis_df
+    if st.session_state.topic_filter.strip():
+        # Statistics restricted to the votations whose title matches the topic
+        filtered_df, topic_votations = load_topic_analysis(st.session_state.topic_filter.strip())
+        st.caption(f"{topic_votations} votaciones coinciden con el tema \"{st.session_state.topic_filter.strip()}\"")
     if st.session_state.block_filter != 'All Blocks':
         filtered_df = filtered_df[filtered_df['block'] == st.session_state.block_filter]
     if st.session_state.search_term:
@@ -56,7 +66,7 @@ def show_deputies_list(analysis_df: pd.DataFrame):
 
     st.subheader(f"Resultados para: {st.session_state.block_filter}")
     metric_col1, metric_col2, metric_col3 = st.columns(3)
-    metric_col1.metric("Total Diputados Encontrados", len(sorted_df['deputy'].unique()))
+    metric_col1.metric("Total Diputados Encontrados", sorted_df['deputy'].nunique())
     metric_col2.metric("Lealtad Promedio del Grupo", f"{sorted_df['average_loyalty'].mean():.1%}")
     metric_col3.metric("Apoyo Promedio al Oficialismo", f"{sorted_df['officialism_support'].mean():.1%}")
     
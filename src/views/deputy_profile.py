@@ -1,12 +1,13 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+
+from src.data_loader import load_deputy_timelines
 
 def show_deputy_profile(deputy_name: str, full_df: pd.DataFrame):
     """
     Renders the detailed profile page for a specific deputy.
     """
+    import plotly.express as px
 
     if st.button("Volver a la lista de diputados"):
         st.session_state.selected_deputy = None
@@ -106,6 +107,33 @@ def show_deputy_profile(deputy_name: str, full_df: pd.DataFrame):
     
     st.divider()
     
-    # st.subheader("Análisis Detallado")
-    # Placeholder for more detailed charts for this specific deputy
-    # st.info("Aquí podrías mostrar un historial de votos clave, un radar de afinidad, etc.")
\ No newline at end of file
+    # Evolución temporal - series precalculadas por la etapa de análisis
+    st.subheader("Evolución en el Tiempo")
+    ventana = st.select_slider(
+        "Promedio móvil (votaciones)",
+        options=[5, 10, 20, 50, 100],
+        value=20,
+        key="timeline_window"
+    )
+    
+    serie_df = load_deputy_timelines().series(deputy_name, window=ventana, max_points=300)
+    
+    if not serie_df.empty:
+        serie_df = serie_df.rename(columns={
+            'loyalty': 'Lealtad al Bloque',
+            'officialism': 'Apoyo al Oficialismo',
+            'attendance': 'Asistencia'
+        })
+        fig_serie = px.line(
+            serie_df,
+            labels={'date': 'Fecha', 'value': 'Promedio móvil', 'variable': 'Indicador'},
+        )
+        fig_serie.update_yaxes(range=[0, 1.05], tickformat='.0%')
+        fig_serie.update_layout(legend_title="Indicador", hovermode='x unified')
+        st.plotly_chart(fig_serie, use_container_width=True)
+        st.caption(
+            f"Promedio de las últimas {ventana} votaciones en cada fecha; "
+            "las ausencias cuentan como votos no alineados."
+        )
+    else:
+        st.info("No hay votaciones registradas para este diputado.")
\ No newline at end of file
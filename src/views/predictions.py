@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from src.data_loader import load_analysis_data
+from src.data_loader import load_prediction_model
 
 def show_predictions():
 	"""Display predictions page with top 10 deputies by prediction accuracy."""
@@ -10,17 +10,39 @@ def show_predictions():
 		st.rerun()
 	
 	st.title("🎯 Predicciones Legislativas")
+
+	model = load_prediction_model()
+
+	if model.predictions.empty:
+		st.warning("No hay votaciones cargadas para generar predicciones.")
+		return
+
+	# Walk-forward evaluation of the outcome model
+	st.header("Precisión del Modelo de Predicción")
+	st.markdown("""
+	Cada votación se predice con la preferencia histórica de cada bloque ponderada
+	por su cantidad de bancas, usando sólo las votaciones anteriores a esa fecha.
+	""")
+
+	evaluated = len(model.predictions)
+	col1, col2, col3 = st.columns(3)
+	col1.metric("Votaciones Evaluadas", evaluated)
+	col2.metric("Aciertos del Modelo", int(model.predictions['correct'].sum()))
+	col3.metric("% Precisión", f"{model.model_accuracy():.1%}")
+
+	st.divider()
+
 	st.header("Top 10 Diputados con Mayor Precisión Predictiva")
 	
 	st.markdown("""
-	Estos son los diputados que más aciertos tienen al predecir el resultado final 
-	de las votaciones basándose en su historial de votos.
+	Estos son los diputados cuyo voto coincide más veces con el resultado final 
+	de las votaciones.
 	""")
-	df_analisis = load_analysis_data()
-	top_predictors = df_analisis.sort_values(
-		by=['total_votes', 'accerted'], 
-		ascending=False
-	).head(10)
+
+	# Only deputies that voted in at least half of the votations qualify
+	min_votes = evaluated // 2
+	top_predictors = model.deputy_accuracy(min_votes=min_votes).head(10)
+	st.caption(f"Ranking basado en diputados con al menos {min_votes} votos emitidos de {evaluated} votaciones")
 	st.write("---")
 	
 	# Display top 10 predictors with enhanced layout
@@ -41,19 +63,19 @@ def show_predictions():
 				with stat_col1:
 					st.metric(
 						label="Aciertos", 
-						value=f"{diputado.accerted}"
+						value=f"{diputado.hits}"
 					)
 				
 				with stat_col2:
 					st.metric(
 						label="% Precisión", 
-						value=f"{diputado.accerted/diputado.total_votes:.1%}"
+						value=f"{diputado.accuracy:.1%}"
 					)
 				
 				with stat_col3:
 					st.metric(
-						label="Lealtad al Bloque", 
-						value=f"{diputado.average_loyalty:.1%}"
+						label="Votos Emitidos", 
+						value=f"{diputado.votes}"
 					)
 			
-			st.divider()
\ No newline at end of file
+			st.divider()
@@ -0,0 +1,86 @@
+"""
+Offline tests of the chamber source adapters against recorded pages in
+tests/fixtures/<chamber>. The reference parsers are the original
+`src.scraping.scrape` functions, so the adapters must keep producing the
+rows already stored in the database.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.scraping.sources import DiputadosSource, FixtureTransport
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def original_parse_votation_list(html_content):
+	"""Votation list parser of the original scrape.py."""
+	laws_data = []
+	soup = BeautifulSoup(html_content, 'html.parser')
+	table = soup.find('tbody', attrs={'id': "container-actas"})
+	for row in table.find_all('tr'):
+		cells = row.find_all('td')
+		laws_data.append({
+			'id': row.get('id'),
+			'date': datetime.strptime(cells[0].text.strip()[:10], '%d/%m/%Y').date(),
+			'title': cells[1].text.strip(),
+			'type': cells[2].text.strip(),
+			'result': 'positive' if cells[2].text.strip() == 'AFIRMATIVO' else 'negative',
+			'loaded': 0,
+			'analyzed': 0
+		})
+	return laws_data
+
+
+def original_parse_votation_data(html_content, id):
+	"""Acta parser of the original scrape.py."""
+	votation_data = []
+	soup = BeautifulSoup(html_content, 'html.parser')
+	table = soup.find('table', attrs={'id': "myTable"})
+	for row in table.find('tbody').find_all('tr'):
+		cells = row.find_all('td')
+		votation_data.append({
+			'vote_id': id,
+			'deputy': cells[1].text.strip(),
+			'block': cells[2].text.strip(),
+			'province': cells[3].text.strip(),
+			'vote': cells[4].text.strip(),
+		})
+	return votation_data
+
+
+@pytest.fixture
+def diputados():
+	return DiputadosSource(FixtureTransport(FIXTURES_DIR / "diputados"))
+
+
+def test_diputados_list_matches_original_parser(diputados):
+	html = (FIXTURES_DIR / "diputados" / "list_2024.html").read_text(encoding='utf-8')
+	expected = [{**votation, 'chamber': 'diputados'} for votation in original_parse_votation_list(html)]
+
+	votations = diputados.list_votations(2024)
+
+	assert votations == expected
+	assert [votation['id'] for votation in votations] == ['5801', '5802', '5803']
+
+
+def test_diputados_acta_matches_original_parser(diputados):
+	html = (FIXTURES_DIR / "diputados" / "acta_5801.html").read_text(encoding='utf-8')
+
+	votes = diputados.scrape_votation_data('5801')
+
+	assert votes == original_parse_votation_data(html, '5801')
+	assert {vote['vote'] for vote in votes} == {'AFIRMATIVO', 'NEGATIVO', 'AUSENTE', 'ABSTENCION', 'PRESIDENTE'}
+
+
+def test_diputados_acta_without_votes_table_is_rejected(diputados):
+	with pytest.raises(ValueError):
+		diputados.parse_votation_data("<html><body>Mantenimiento</body></html>", '5801')
+
+
+def test_fixture_transport_without_recorded_page(diputados):
+	with pytest.raises(FileNotFoundError):
+		diputados.scrape_votation_data('5802')